@@ -0,0 +1,526 @@
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+import mainbot
+from mainbot import (
+    DEFAULT_TIER, Rune, RuneIndex, RuneSnapshot, api_cache, app, bot, load_changelog, load_runes,
+    load_runes_from_excel, may_be_command, page_cache, reload_runes, response_cache,
+)
+from rune_parser import (
+    DETAIL_PATTERN, MISSING_STATS, PARSER_VERSION, RUNE_PATTERN, RUNES_FILE, RUNES_SHEET,
+    extract_runes, find_stats, iter_sheet_rows, open_workbook, parse_rune_frame, read_rune_sheet, sheet_cells,
+)
+
+# Benchmarks and parser checks for mainbot, kept out of the bot process:
+# python bench.py <command>
+
+def parse_rune_frame_legacy(df):
+    """Row-by-row parser, kept as the reference for check-parser and the parser tests"""
+    import pandas as pd
+    
+    runes = {}
+    
+    # Parse the data to extract rune information
+    current_category = ""
+    
+    for index, row in df.iterrows():
+        # Skip empty rows
+        if row.isna().all():
+            continue
+            
+        # Convert row to list and filter out NaN values
+        row_data = [str(cell) for cell in row if pd.notna(cell)]
+        
+        # Look for category headers (rows that contain "Rune:")
+        for cell in row_data:
+            if "Rune:" in cell and not cell.startswith("http"):
+                current_category = cell[:cell.index("Rune:") + len("Rune:")].strip()
+                break
+        
+        # Look for rune entries (cells that contain rarity patterns like "1/")
+        for cell in row_data:
+            if "1/" in cell and not cell.startswith("http"):
+                # Extract rune name and rarity, from "- Name rarity" detail entries or "(rarity) Name" order cells
+                if cell.startswith("- "):
+                    match = re.search(DETAIL_PATTERN, cell)
+                    rune = (match.group(1), re.sub(r'\s', '', match.group(2))) if match else None
+                else:
+                    match = re.search(RUNE_PATTERN, cell)
+                    rune = (match.group(2), match.group(1)) if match else None
+                if rune:
+                    rune_name, rarity = rune[0].strip(), rune[1]
+                    
+                    # Get stats from the next row if available
+                    stats = MISSING_STATS
+                    if index + 1 < len(df):
+                        next_row = df.iloc[index + 1]
+                        next_row_data = [str(cell) for cell in next_row if pd.notna(cell)]
+                        if next_row_data:
+                            # Look for stats in the same column or nearby
+                            for next_cell in next_row_data:
+                                if "Stats:" in next_cell:
+                                    stats = next_cell.replace("Stats:", "").strip()
+                                    break
+                    
+                    runes[rune_name] = {
+                        "rarity": rarity,
+                        "category": current_category if current_category else "Unknown",
+                        "stats": stats
+                    }
+    
+    return runes
+
+def check_parser_command():
+    """CLI: verify the vectorized and streaming parsers match the legacy row-by-row parser"""
+    df = read_rune_sheet(RUNES_FILE)
+    
+    start = time.perf_counter()
+    expected = parse_rune_frame_legacy(df)
+    print(f"Legacy parser: {len(expected)} runes in {(time.perf_counter() - start) * 1000:.1f}ms")
+    
+    parsers = {
+        "Vectorized": lambda: parse_rune_frame(df),
+        "Streaming": lambda: extract_runes(iter_sheet_rows(RUNES_FILE)),
+    }
+    failed = False
+    for label, parse in parsers.items():
+        start = time.perf_counter()
+        actual = parse()
+        print(f"{label} parser: {len(actual)} runes in {(time.perf_counter() - start) * 1000:.1f}ms")
+        if list(actual.items()) == list(expected.items()):
+            continue
+        failed = True
+        for name in sorted(set(expected) | set(actual)):
+            if expected.get(name) != actual.get(name):
+                print(f"  MISMATCH {name!r}: expected {expected.get(name)} got {actual.get(name)}")
+        if list(actual) != list(expected):
+            print("  MISMATCH in rune order")
+    
+    if failed:
+        sys.exit("Parser output differs from the legacy parser")
+    print("Parser output matches the legacy parser")
+
+# Rune names, rarities and categories the parser is expected to produce from BROT13.xlsx
+RUNES_GOLDEN_FILE = 'runes_golden.json'
+# Runs per stage in bench-parser; the median is reported
+PARSER_BENCH_RUNS = 5
+
+def golden_runes(runes):
+    """The fields of parsed runes kept in the golden file, in parse order"""
+    return [{"name": name, "rarity": info["rarity"], "category": info["category"]} for name, info in runes.items()]
+
+def diff_golden(expected, actual):
+    """Lines describing how parsed runes differ from the golden file"""
+    expected_by_name = {rune["name"]: rune for rune in expected}
+    actual_by_name = {rune["name"]: rune for rune in actual}
+    lines = []
+    for name in expected_by_name.keys() - actual_by_name.keys():
+        lines.append(f"- {name!r} ({expected_by_name[name]['rarity']}, {expected_by_name[name]['category']})")
+    for name in actual_by_name.keys() - expected_by_name.keys():
+        lines.append(f"+ {name!r} ({actual_by_name[name]['rarity']}, {actual_by_name[name]['category']})")
+    for name in expected_by_name.keys() & actual_by_name.keys():
+        for field in ("rarity", "category"):
+            if expected_by_name[name][field] != actual_by_name[name][field]:
+                lines.append(f"~ {name!r} {field}: {expected_by_name[name][field]!r} -> {actual_by_name[name][field]!r}")
+    lines.sort()
+    if not lines and [rune["name"] for rune in expected] != [rune["name"] for rune in actual]:
+        lines.append("~ rune order changed")
+    return lines
+
+def bench_parser_command():
+    """CLI: time the spreadsheet parser per stage, measure its peak memory and diff it against the golden file
+    
+    Pass --update-golden to accept the current parser output as the new golden file."""
+    import tracemalloc
+    
+    def median_ms(run):
+        timings = []
+        result = None
+        for _ in range(PARSER_BENCH_RUNS):
+            start = time.perf_counter()
+            result = run()
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)[len(timings) // 2], min(timings), result
+    
+    stages = []
+    
+    def stage(label, run):
+        median, fastest, result = median_ms(run)
+        stages.append((label, median, fastest))
+        return result
+    
+    workbook = stage("workbook open", lambda: open_workbook(RUNES_FILE))
+    rows = stage("sheet read", lambda: list(workbook[RUNES_SHEET].iter_rows(values_only=True)))
+    workbook.close()
+    cells = stage("row walk", lambda: list(sheet_cells(rows)))
+    
+    # Split extraction into the regex matching and the stats lookups it calls
+    stats_seconds = []
+    
+    def timed_find_stats(row):
+        start = time.perf_counter()
+        try:
+            return find_stats(row)
+        finally:
+            stats_seconds[-1] += time.perf_counter() - start
+    
+    def extract():
+        stats_seconds.append(0.0)
+        return extract_runes(cells, timed_find_stats)
+    
+    extract_median, extract_fastest, runes = median_ms(extract)
+    stats_ms = sorted(seconds * 1000 for seconds in stats_seconds)
+    stats_median = stats_ms[len(stats_ms) // 2]
+    stages.append(("regex extraction", extract_median - stats_median, extract_fastest - stats_ms[0]))
+    stages.append(("stats lookup", stats_median, stats_ms[0]))
+    
+    stage("end to end (stream)", lambda: extract_runes(iter_sheet_rows(RUNES_FILE)))
+    stage("end to end (pandas)", lambda: parse_rune_frame(read_rune_sheet(RUNES_FILE)))
+    stage("load_runes_from_excel", load_runes_from_excel)
+    
+    tracemalloc.start()
+    load_runes_from_excel()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    print(f"\n{'stage':<24} {'median ms':>10} {'min ms':>10}")
+    for label, median, fastest in stages:
+        print(f"{label:<24} {median:>10.2f} {fastest:>10.2f}")
+    print(f"Peak memory in load_runes_from_excel: {peak / 1024 / 1024:.2f} MiB ({len(runes)} runes, parser v{PARSER_VERSION})")
+    
+    actual = golden_runes(runes)
+    if '--update-golden' in sys.argv[2:]:
+        # One rune per line, so changes to the golden file diff cleanly
+        with open(RUNES_GOLDEN_FILE, 'w', encoding='utf-8') as f:
+            f.write("[\n" + ",\n".join(json.dumps(rune, ensure_ascii=False) for rune in actual) + "\n]\n")
+        print(f"Wrote {len(actual)} runes to {RUNES_GOLDEN_FILE}")
+        return
+    
+    try:
+        with open(RUNES_GOLDEN_FILE, encoding='utf-8') as f:
+            expected = json.load(f)
+    except FileNotFoundError:
+        sys.exit(f"{RUNES_GOLDEN_FILE} not found, create it with --update-golden")
+    
+    differences = diff_golden(expected, actual)
+    if differences:
+        print(f"Parser output differs from {RUNES_GOLDEN_FILE}:")
+        for line in differences:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"Parser output matches {RUNES_GOLDEN_FILE}")
+
+def bench_fuzzy_command():
+    """CLI: time typo-tolerant lookups as the rune list grows to thousands of entries"""
+    reload_runes(force=True)
+    rng = random.Random(13)
+    # Pronounceable consonant-vowel syllables, like the real rune names
+    syllables = [c + v for c in "bcdfghklmnprstvxyz" for v in "aeiouy"] + ["th", "st", "or", "ar", "um", "yss"]
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    
+    def misspell(name):
+        i = rng.randrange(len(name))
+        edit = rng.choice(("drop", "swap", "insert"))
+        if edit == "drop":
+            return name[:i] + name[i + 1:]
+        if edit == "swap":
+            return name[:i] + rng.choice(letters) + name[i + 1:]
+        return name[:i] + rng.choice(letters) + name[i:]
+    
+    base = {name: rune for name, rune in mainbot.rune_snapshot.runes.items() if name}
+    print(f"{'runes':>8} {'build ms':>10} {'mean us':>9} {'p99 us':>9} {'hit rate':>9} {'complete p99 us':>16}")
+    for size in (len(base), 1000, 5000, 10000):
+        runes = dict(base)
+        while len(runes) < size:
+            name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).title()
+            runes.setdefault(name, Rune(name, "1/1B", "Synthetic", ""))
+        
+        start = time.perf_counter()
+        index = RuneIndex(runes)
+        build_ms = (time.perf_counter() - start) * 1000
+        
+        targets = [rng.choice(list(runes)) for _ in range(500)]
+        timings = []
+        hits = 0
+        for target in targets:
+            query = misspell(target)
+            start = time.perf_counter()
+            matches = index.suggest(query)
+            timings.append((time.perf_counter() - start) * 1e6)
+            hits += any(name == target for name, _ in matches)
+        timings.sort()
+        
+        # Autocomplete answers every keystroke, so time each prefix of the target names
+        completions = []
+        for target in targets[:100]:
+            for end in range(len(target) + 1):
+                start = time.perf_counter()
+                index.complete_names(target[:end])
+                completions.append((time.perf_counter() - start) * 1e6)
+        completions.sort()
+        print(f"{size:>8} {build_ms:>10.1f} {sum(timings) / len(timings):>9.1f} "
+              f"{timings[int(len(timings) * 0.99)]:>9.1f} {hits / len(targets):>9.0%} "
+              f"{completions[int(len(completions) * 0.99)]:>16.1f}")
+
+def bench_dashboard_command():
+    """CLI: requests per second for the dashboard pages, rendered per request vs cached"""
+    client = app.test_client()
+    
+    def measure(path, headers, seconds=1.0):
+        count = 0
+        sent = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            sent += len(client.get(path, headers=headers).data)
+            count += 1
+        return count / (time.perf_counter() - start), sent // count
+    
+    print(f"{'page':<12} {'mode':<22} {'req/s':>10} {'bytes/resp':>11}")
+    for path in ('/', '/changelog'):
+        etag = client.get(path).headers['ETag']
+        modes = [
+            ("render per request", False, {}),
+            ("cached", True, {}),
+            ("cached + gzip", True, {'Accept-Encoding': 'gzip'}),
+            ("304 revalidation", True, {'If-None-Match': etag}),
+        ]
+        for label, cached, headers in modes:
+            page_cache.enabled = cached
+            rate, size = measure(path, headers)
+            print(f"{path:<12} {label:<22} {rate:>10.0f} {size:>11}")
+    page_cache.enabled = True
+
+def bench_api_command():
+    """CLI: requests per second for the JSON API, serialized per request vs cached vs revalidated"""
+    tiers, source_hash, compiled_at = load_runes()
+    mainbot.rune_snapshot = RuneSnapshot(tiers, source_hash, 1, 0, compiled_at)
+    client = app.test_client()
+    cache_size = api_cache.max_size
+    
+    def measure(path, headers, seconds=1.0):
+        count = 0
+        sent = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            sent += len(client.get(path, headers=headers).data)
+            count += 1
+        return count / (time.perf_counter() - start), sent // count
+    
+    name = next(iter(mainbot.rune_snapshot.runes), '')
+    paths = ['/api/runes?limit=200', '/api/runes?fields=rarity&limit=20', f'/api/runes/{name}', '/api/categories', '/api/search?q=rune']
+    print(f"{'path':<36} {'mode':<20} {'req/s':>10} {'bytes/resp':>11}")
+    for path in paths:
+        response = client.get(path)
+        modes = [
+            ("serialize per request", 0, {}),
+            ("cached", cache_size, {}),
+            ("cached + gzip", cache_size, {'Accept-Encoding': 'gzip'}),
+            ("304 by ETag", cache_size, {'If-None-Match': response.headers['ETag']}),
+            ("304 by date", cache_size, {'If-Modified-Since': response.headers['Last-Modified']}),
+        ]
+        for label, max_size, headers in modes:
+            api_cache.max_size = max_size
+            api_cache.entries.clear()
+            rate, size = measure(path, headers)
+            print(f"{path:<36} {label:<20} {rate:>10.0f} {size:>11}")
+    api_cache.max_size = cache_size
+
+def bench_on_message_command():
+    """CLI: messages per second through on_message's pre-filter"""
+    def fake_message(content, is_bot=False, guild_id=1, channel_id=10):
+        return SimpleNamespace(
+            content=content,
+            author=SimpleNamespace(bot=is_bot),
+            guild=SimpleNamespace(id=guild_id),
+            channel=SimpleNamespace(id=channel_id, parent_id=None),
+        )
+    
+    chatter = [fake_message(text) for text in ("gg", "anyone got bloom yet?", "lol", "how do i get aether", "nice")]
+    mixes = {
+        "chatter": chatter,
+        "bot messages": [fake_message("!rune Bloom", is_bot=True)],
+        "commands": [fake_message("!rune Bloom"), fake_message("!latest")],
+        "95% chatter": chatter * 19 + [fake_message("!rune Bloom"), fake_message("!search star")] * 2 + [fake_message("!latest")],
+    }
+    
+    print(f"{'messages':<14} {'msgs/s':>12} {'passed':>8}")
+    for label, messages in mixes.items():
+        count = 0
+        passed = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < 1.0:
+            for message in messages:
+                passed += may_be_command(message)
+            count += len(messages)
+        rate = count / (time.perf_counter() - start)
+        print(f"{label:<14} {rate:>12,.0f} {passed / count:>8.0%}")
+
+class CaptureContext:
+    """Stand-in for a command context that keeps what the command sends"""
+    
+    def __init__(self):
+        self.sent = []
+        self.channel = SimpleNamespace(id=0)
+    
+    async def send(self, *args, **kwargs):
+        self.sent.append((args, kwargs))
+
+def scaled_runes(runes, factor):
+    """Rune data with factor copies of every rune, the copies named 'Bloom 2', 'Bloom 3', ..."""
+    scaled = {}
+    for copy in range(factor):
+        for name, rune in runes.items():
+            if copy and not name:
+                continue
+            key = f"{name} {copy + 1}" if copy else name
+            scaled[key] = {"rarity": rune.rarity, "category": rune.category, "stats": rune.stats}
+    return scaled
+
+def synthetic_query_mix(snapshot, count, rng):
+    """Message contents resembling what users send, weighted towards rune lookups"""
+    names = [name for name in snapshot.runes if name]
+    categories = [snapshot.index.category_labels[key] for key in snapshot.index.sorted_categories]
+    stats = [snapshot.index.stat_labels[key] for key in snapshot.index.sorted_stats] or ["Rune Speed"]
+    changes = load_changelog()['changes']
+    
+    def misspelled():
+        name = rng.choice(names)
+        i = rng.randrange(len(name))
+        return name[:i] + name[i + 1:]
+    
+    queries = [
+        (30, lambda: f"!rune {rng.choice(names)}"),
+        (10, lambda: f"!rune {misspelled()}"),
+        (5, lambda: f"!rune {rng.choice(names)[:3]}"),
+        (15, lambda: f"!search {rng.choice(names)[:rng.randint(3, 5)]}"),
+        (3, lambda: f"!search rarity:{rng.choice(['1K-1B', '1B-1T', '1T-1De', '1De-1Ce'])}"),
+        (10, lambda: f"!category {rng.choice(categories)}"),
+        (5, lambda: f"!stat {rng.choice(stats)}"),
+        (5, lambda: "!runes"),
+        (2, lambda: "!runes sort:rarity"),
+        (2, lambda: "!rarest"),
+        (5, lambda: "!latest"),
+        (4, lambda: "!changelog"),
+        (2, lambda: f"!changelog {rng.choice(changes)['version']}"),
+        (1, lambda: "!versions"),
+        (1, lambda: "!version"),
+    ]
+    weights = [weight for weight, _ in queries]
+    return [make() for _, make in rng.choices(queries, weights=weights, k=count)]
+
+async def invoke_command(content, ctx):
+    """Run the prefix command in a message's content directly, without the gateway; returns its name"""
+    name, _, argument = content[1:].partition(' ')
+    command = bot.get_command(name)
+    if command is None:
+        raise ValueError(f"Unknown command in query mix: {content!r}")
+    
+    args = []
+    kwargs = {}
+    for param in command.clean_params.values():
+        if param.kind == param.KEYWORD_ONLY:
+            if argument:
+                kwargs[param.name] = argument
+        elif argument:
+            args.append(argument)
+    await command.callback(ctx, *args, **kwargs)
+    return command.name
+
+def bench_commands_command():
+    """CLI: per-command latency and allocations, driving the command handlers with a fake context
+    
+    Options: --mix FILE replays recorded message contents (one '!command args' per line)
+    instead of the synthetic mix; --queries N sets how many queries run per scale."""
+    import tracemalloc
+    
+    options = sys.argv[2:]
+    query_count = int(options[options.index('--queries') + 1]) if '--queries' in options else 2000
+    recorded = None
+    if '--mix' in options:
+        with open(options[options.index('--mix') + 1], encoding='utf-8') as f:
+            recorded = [line.strip() for line in f if line.strip().startswith('!')]
+    
+    reload_runes(force=True)
+    base = mainbot.rune_snapshot
+    rng = random.Random(21)
+    
+    def percentile(values, fraction):
+        return values[min(len(values) - 1, int(len(values) * fraction))]
+    
+    async def replay(queries, cold):
+        """Per-command latencies in microseconds and peak allocated bytes per call"""
+        timings = {}
+        allocations = {}
+        ctx = CaptureContext()
+        for content in queries:
+            if cold:
+                response_cache.entries.clear()
+            ctx.sent.clear()
+            start = time.perf_counter()
+            name = await invoke_command(content, ctx)
+            timings.setdefault(name, []).append((time.perf_counter() - start) * 1e6)
+        
+        # Allocations in a separate pass, tracemalloc slows everything down
+        tracemalloc.start()
+        for content in queries[:200]:
+            if cold:
+                response_cache.entries.clear()
+            ctx.sent.clear()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            name = await invoke_command(content, ctx)
+            _, peak = tracemalloc.get_traced_memory()
+            allocations.setdefault(name, []).append(peak - before)
+        tracemalloc.stop()
+        return timings, allocations
+    
+    async def run():
+        print(f"{'scale':>6} {'runes':>7} {'command':<10} {'calls':>6} {'warm p50':>9} {'warm p99':>9} "
+              f"{'cold p50':>9} {'cold p99':>9} {'KiB/call':>9}")
+        for factor in (1, 10, 100):
+            start = time.perf_counter()
+            scaled = {DEFAULT_TIER: {"runes": scaled_runes(base.runes, factor), "recommended": base.default_tier.recommended}}
+            mainbot.rune_snapshot = RuneSnapshot(scaled, None, base.version + factor, 0.0)
+            build_ms = (time.perf_counter() - start) * 1000
+            queries = recorded or synthetic_query_mix(mainbot.rune_snapshot, query_count, rng)
+            
+            response_cache.entries.clear()
+            warm, _ = await replay(queries, cold=False)
+            cold, allocations = await replay(queries, cold=True)
+            
+            total_seconds = sum(map(sum, warm.values())) / 1e6
+            for name in sorted(cold):
+                warm_times = sorted(warm[name])
+                cold_times = sorted(cold[name])
+                kib = sum(allocations.get(name, [0])) / max(1, len(allocations.get(name, []))) / 1024
+                print(f"{factor:>5}x {len(mainbot.rune_snapshot.runes):>7} {name:<10} {len(cold_times):>6} "
+                      f"{percentile(warm_times, 0.5):>9.1f} {percentile(warm_times, 0.99):>9.1f} "
+                      f"{percentile(cold_times, 0.5):>9.1f} {percentile(cold_times, 0.99):>9.1f} {kib:>9.1f}")
+            print(f"{factor:>5}x index built in {build_ms:.0f}ms, warm replay {len(queries) / total_seconds:,.0f} queries/s\n")
+    
+    try:
+        asyncio.run(run())
+    finally:
+        mainbot.rune_snapshot = base
+        response_cache.entries.clear()
+
+# Command line tools: python bench.py <command>
+CLI_COMMANDS = {
+    'check-parser': check_parser_command,
+    'bench-fuzzy': bench_fuzzy_command,
+    'bench-parser': bench_parser_command,
+    'bench-dashboard': bench_dashboard_command,
+    'bench-api': bench_api_command,
+    'bench-on-message': bench_on_message_command,
+    'bench-commands': bench_commands_command,
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in CLI_COMMANDS:
+        sys.exit(f"Usage: python bench.py <command>. Available: {', '.join(CLI_COMMANDS)}")
+    CLI_COMMANDS[sys.argv[1]]()
@@ -1,41 +1,160 @@
 import discord
-from discord.ext import commands
-import pandas as pd
+from discord import app_commands
+from discord.ext import commands, tasks
 import os
 import re
-from flask import Flask
+from flask import Flask, Response, request
+from aiohttp import web
 from threading import Thread
+import threading
 import uuid
 import asyncio
 import requests
 import time
 import json
-from datetime import datetime
+import sys
+import hashlib
+import bisect
+import itertools
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from types import MappingProxyType
+from functools import cached_property
+import hmac
+import glob
+import signal
+import subprocess
+import tempfile
+import sqlite3
+from contextlib import closing
+import contextvars
+from contextlib import contextmanager
+import gzip
+import base64
+from email.utils import formatdate, parsedate_to_datetime
+import math
+import traceback
+import html
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from rune_parser import MISSING_STATS, PARSER_VERSION, RUNES_FILE, RUNES_SHEET, parse_rune_sheet, parse_runes_from_excel
 # Create a unique instance ID for this bot instance
 INSTANCE_ID = str(uuid.uuid4())[:8]
 print(f"Starting bot instance: {INSTANCE_ID}")
 
-# Flask web server to satisfy Render's port detection
+# Startup timings, reported on /status
+BOOT_TIME = time.monotonic()
+startup_timings = {
+    "runes_ready_after_s": None,
+    "first_response_after_s": None,
+}
+
+# Web server to satisfy Render's port detection: 'aiohttp' runs on the bot's
+# event loop, 'flask' runs Flask's server on a separate thread, 'none' disables it
+HTTP_SERVER = os.environ.get('HTTP_SERVER', 'aiohttp')
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get('HTTP_KEEPALIVE_TIMEOUT', 75))
+HTTP_BACKLOG = int(os.environ.get('HTTP_BACKLOG', 128))
+
 app = Flask('')
 app.instance_id = INSTANCE_ID
 
+CHANGELOG_FILE = 'changelog.json'
+
+def render_change_lists(change):
+    """HTML <li> items for a changelog entry's features and fixes"""
+    features = ''.join([f'<li class="feature">{feature}</li>' for feature in change.get('features', [])]) or '<li>No new features</li>'
+    fixes = ''.join([f'<li class="fix">{fix}</li>' for fix in change.get('fixes', [])]) or '<li>No bug fixes</li>'
+    return features, fixes
+
+class LoadedChangelog:
+    """One load of changelog.json with its version index and pre-rendered HTML"""
+    
+    def __init__(self, data, generation):
+        self.data = data
+        self.generation = generation
+        self.by_version = {}
+        self.change_lists = {}
+        change_boxes = []
+        for change in data['changes']:
+            self.by_version.setdefault(change['version'], change)
+            features, fixes = render_change_lists(change)
+            self.change_lists.setdefault(change['version'], (features, fixes))
+            change_boxes.append(f"""
+        <div class="changelog-box">
+            <h3>Version {change['version']} - {change['date']}</h3>
+            <h4>✨ Features</h4>
+            <ul>
+                {features}
+            </ul>
+            <h4>🔧 Fixes</h4>
+            <ul>
+                {fixes}
+            </ul>
+        </div>
+        """)
+        self.changes_html = "".join(change_boxes)
+        
+        self.latest = data['changes'][0] if data['changes'] else {}
+        self.latest_lists = render_change_lists(self.latest)
+
+class ChangelogStore:
+    """changelog.json kept in memory, re-read only when the file's mtime or size changes"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.stamp = None
+        self.current = None
+        self.lock = threading.Lock()
+    
+    def loaded(self):
+        """Current LoadedChangelog, re-validated with a stat of the file"""
+        stamp = file_stamp(self.path)
+        if self.current is None or stamp != self.stamp:
+            with self.lock:
+                if self.current is None or stamp != self.stamp:
+                    generation = self.current.generation + 1 if self.current else 1
+                    self.current = LoadedChangelog(self._read(), generation)
+                    self.stamp = stamp
+        return self.current
+    
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # Return default changelog if file doesn't exist
+            return {
+                "version": BOT_VERSION,
+                "last_updated": datetime.now().strftime("%Y-%m-%d"),
+                "changes": [{
+                    "version": BOT_VERSION,
+                    "date": datetime.now().strftime("%Y-%m-%d"),
+                    "features": ["Initial changelog system"],
+                    "fixes": []
+                }]
+            }
+    
+    def get(self):
+        """Current changelog data; callers must not modify it"""
+        return self.loaded().data
+    
+    def find(self, version):
+        """Changelog entry for a version string, or None"""
+        return self.loaded().by_version.get(version)
+
+changelog_store = ChangelogStore(CHANGELOG_FILE)
+
 def load_changelog():
     """Load changelog data from file"""
-    try:
-        with open('changelog.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {
-            "version": BOT_VERSION,
-            "last_updated": datetime.now().strftime("%Y-%m-%d"),
-            "changes": []
-        }
+    return changelog_store.get()
 
 
-@app.route('/')
-def home():
-    changelog = load_changelog()
-    latest_changes = changelog['changes'][0] if changelog['changes'] else {}
+def render_home_page(loaded):
+    """Dashboard HTML for one changelog load"""
+    changelog = loaded.data
+    latest_changes = loaded.latest
+    latest_features, latest_fixes = loaded.latest_lists
     
     return f"""
     <html>
@@ -77,12 +196,12 @@ def home():
                     
                     <h3>✨ New Features</h3>
                     <ul>
-                        {''.join([f'<li class="feature">{feature}</li>' for feature in latest_changes.get('features', [])]) or '<li>No new features</li>'}
+                        {latest_features}
                     </ul>
                     
                     <h3>🔧 Bug Fixes</h3>
                     <ul>
-                        {''.join([f'<li class="fix">{fix}</li>' for fix in latest_changes.get('fixes', [])]) or '<li>No bug fixes</li>'}
+                        {latest_fixes}
                     </ul>
                 </div>
                 
@@ -107,25 +226,10 @@ def home():
     </html>
     """
 
-@app.route('/changelog')
-def full_changelog():
-    changelog = load_changelog()
-    
-    changes_html = ""
-    for change in changelog['changes']:
-        changes_html += f"""
-        <div class="changelog-box">
-            <h3>Version {change['version']} - {change['date']}</h3>
-            <h4>✨ Features</h4>
-            <ul>
-                {''.join([f'<li class="feature">{feature}</li>' for feature in change.get('features', [])]) or '<li>No new features</li>'}
-            </ul>
-            <h4>🔧 Fixes</h4>
-            <ul>
-                {''.join([f'<li class="fix">{fix}</li>' for fix in change.get('fixes', [])]) or '<li>No bug fixes</li>'}
-            </ul>
-        </div>
-        """
+def render_changelog_page(loaded):
+    """Full changelog HTML for one changelog load"""
+    changelog = loaded.data
+    changes_html = loaded.changes_html
     
     return f"""
     <html>
@@ -156,21 +260,223 @@ def full_changelog():
     </html>
     """
 
-@app.route('/status')
-def status():
+class RenderedPage:
+    """A page rendered once, with its strong ETag and gzip variant"""
+    
+    def __init__(self, body, version, content_type='text/html; charset=utf-8'):
+        self.version = version
+        self.content_type = content_type
+        self.body = body.encode('utf-8')
+        digest = hashlib.sha1(self.body).hexdigest()
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+    
+    @cached_property
+    def gzip_body(self):
+        return gzip.compress(self.body, compresslevel=9, mtime=0)
+
+class PageCache:
+    """Dashboard pages, re-rendered only when the data they show changes"""
+    
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.pages = {}
+    
+    def get(self, name, version, render):
+        page = self.pages.get(name)
+        if page is None or page.version != version or not self.enabled:
+            page = RenderedPage(render(), version)
+            self.pages[name] = page
+        return page
+
+# Serve gzip-compressed pages to clients that accept them
+DASHBOARD_GZIP = os.environ.get('DASHBOARD_GZIP', '1') == '1'
+page_cache = PageCache(enabled=os.environ.get('DASHBOARD_CACHE', '1') == '1')
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header matches the given ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefixes
+    candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return etag in candidates
+
+def not_modified_since(if_modified_since, last_modified):
+    """Whether an If-Modified-Since header is at or after the last_modified timestamp"""
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return since.tzinfo is not None and int(last_modified) <= since.timestamp()
+
+def page_response(page, request_headers, last_modified=None):
+    """(status, headers, body) for a cached page, honouring If-None-Match, If-Modified-Since and Accept-Encoding"""
+    use_gzip = DASHBOARD_GZIP and 'gzip' in request_headers.get('Accept-Encoding', '')
+    etag = page.gzip_etag if use_gzip else page.etag
+    headers = {
+        'Content-Type': page.content_type,
+        'ETag': etag,
+        'Cache-Control': 'no-cache',
+        'Vary': 'Accept-Encoding',
+    }
+    if last_modified is not None:
+        headers['Last-Modified'] = formatdate(last_modified, usegmt=True)
+    # If-Modified-Since only counts when the client sent no ETag to compare
+    if_none_match = request_headers.get('If-None-Match')
+    if etag_matches(if_none_match, etag) or (not if_none_match and not_modified_since(request_headers.get('If-Modified-Since'), last_modified)):
+        return 304, headers, b''
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+        return 200, headers, page.gzip_body
+    return 200, headers, page.body
+
+def dashboard_page(name):
+    """Cached dashboard page by name, rendered for the current changelog"""
+    loaded = changelog_store.loaded()
+    render = render_home_page if name == 'home' else render_changelog_page
+    return page_cache.get(name, loaded.generation, lambda: render(loaded))
+
+@app.route('/')
+def home():
+    status, headers, body = page_response(dashboard_page('home'), request.headers)
+    return Response(body, status=status, headers=headers)
+
+@app.route('/changelog')
+def full_changelog():
+    status, headers, body = page_response(dashboard_page('changelog'), request.headers)
+    return Response(body, status=status, headers=headers)
+
+def format_uptime(seconds):
+    """Human readable uptime, e.g. '2h 5m 13s'"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    parts = [f"{days}d"] if days else []
+    if days or hours:
+        parts.append(f"{hours}h")
+    parts.append(f"{minutes}m {seconds}s")
+    return " ".join(parts)
+
+def status_payload():
+    """Data for /status, including the bot's live gateway state"""
     changelog = load_changelog()
+    uptime = time.monotonic() - BOOT_TIME
+    latency = bot.latency
     return {
         "status": "running",
         "version": changelog['version'],
         "instance_id": INSTANCE_ID,
         "last_updated": changelog['last_updated'],
-        "uptime": "active",
+        "uptime": format_uptime(uptime),
+        "uptime_seconds": round(uptime, 1),
+        "http_server": HTTP_SERVER,
+        "bot_ready": bot.is_ready(),
+        "latency_ms": round(latency * 1000, 1) if math.isfinite(latency) else None,
+        "guilds": len(bot.guilds),
+        "leader": leader.is_leader,
+        "leader_backend": LEADER_BACKEND,
+        "shard_mode": SHARD_MODE,
+        "shards": shard_status(),
+        "runes_loaded": rune_snapshot is not None,
+        "rune_data_version": rune_snapshot.version if rune_snapshot else None,
+        "rune_tiers": {name: len(tier.runes) for name, tier in rune_snapshot.tiers.items()} if rune_snapshot else {},
+        "rune_load_ms": round(rune_snapshot.load_seconds * 1000, 1) if rune_snapshot else None,
+        "rune_load_error": rune_load_error,
+        **startup_timings,
+        "response_cache": response_cache.stats(),
+        "api_cache": api_cache.stats(),
         "timestamp": datetime.now().isoformat()
     }
 
+def health_payload():
+    return {"status": "healthy", "timestamp": datetime.now().isoformat(), "instance_id": INSTANCE_ID}
+
+# Token required by the /reload endpoint; the endpoint is disabled when unset
+RELOAD_TOKEN = os.environ.get('RELOAD_TOKEN')
+
+def reload_authorized(headers, query):
+    """Whether a /reload request carries the reload token"""
+    token = headers.get('X-Reload-Token') or query.get('token', '')
+    return bool(RELOAD_TOKEN) and hmac.compare_digest(token, RELOAD_TOKEN)
+
+@app.route('/status')
+def status():
+    return status_payload()
+
 @app.route('/health')
 def health():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat(), "instance_id": INSTANCE_ID}
+    return health_payload()
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics_text(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/reload', methods=['POST'])
+def reload_endpoint():
+    if not reload_authorized(request.headers, request.args):
+        return {"error": "forbidden"}, 403
+    
+    # Runs on the web server thread, never on the bot's event loop
+    report = reload_runes(force=True)
+    report["timestamp"] = datetime.now().isoformat()
+    return report, 500 if report.get("error") else 200
+
+# Async web server sharing the bot's event loop (HTTP_SERVER=aiohttp)
+
+async def web_home(request):
+    status, headers, body = page_response(dashboard_page('home'), request.headers)
+    return web.Response(body=body, status=status, headers=headers)
+
+async def web_changelog(request):
+    status, headers, body = page_response(dashboard_page('changelog'), request.headers)
+    return web.Response(body=body, status=status, headers=headers)
+
+async def web_status(request):
+    return web.json_response(status_payload())
+
+async def web_health(request):
+    return web.json_response(health_payload())
+
+async def web_metrics(request):
+    return web.Response(text=metrics_text(), content_type='text/plain', headers={'X-Content-Type-Options': 'nosniff'})
+
+async def web_reload(request):
+    if not reload_authorized(request.headers, request.query):
+        return web.json_response({"error": "forbidden"}, status=403)
+    
+    report = await asyncio.to_thread(reload_runes, True)
+    report["timestamp"] = datetime.now().isoformat()
+    return web.json_response(report, status=500 if report.get("error") else 200)
+
+def create_web_app():
+    """aiohttp application serving the same routes as the Flask app"""
+    web_app = web.Application()
+    web_app.add_routes([
+        web.get('/', web_home),
+        web.get('/changelog', web_changelog),
+        web.get('/status', web_status),
+        web.get('/health', web_health),
+        web.get('/metrics', web_metrics),
+        web.post('/reload', web_reload),
+        web.get('/api/runes', web_api('runes')),
+        web.get('/api/runes/{name}', web_api('rune')),
+        web.get('/api/categories', web_api('categories')),
+        web.get('/api/search', web_api('search')),
+    ])
+    return web_app
+
+async def start_web_server():
+    """Start the aiohttp server on the running event loop"""
+    port = int(os.environ.get('PORT', 5000))
+    runner = web.AppRunner(create_web_app(), access_log=None, keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT)
+    await runner.setup()
+    await web.TCPSite(runner, '0.0.0.0', port, backlog=HTTP_BACKLOG).start()
+    print(f"Web server listening on port {port} (aiohttp)")
+    return runner
 
 def run():
     port = int(os.environ.get('PORT', 5000))
@@ -212,372 +518,2303 @@ def start_keep_alive_service():
 intents = discord.Intents.default()
 intents.message_content = True  # This is required for message commands
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+# Per-guild prefixes and channel allowlists, e.g.
+# {"123456789": {"prefixes": ["!", "?"], "channels": [987654321]}}
+GUILD_CONFIG_FILE = os.environ.get('GUILD_CONFIG_FILE', 'guild_config.json')
+DEFAULT_PREFIXES = ('!',)
+
+def load_guild_config(path=GUILD_CONFIG_FILE):
+    """Precomputed prefix tuples and channel sets per guild id"""
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return {}, {}
+    
+    prefixes = {}
+    channels = {}
+    for guild_id, options in config.items():
+        if options.get('prefixes'):
+            prefixes[int(guild_id)] = tuple(options['prefixes'])
+        if options.get('channels'):
+            channels[int(guild_id)] = frozenset(int(channel_id) for channel_id in options['channels'])
+    print(f"Loaded settings for {len(config)} guilds from {path}")
+    return prefixes, channels
 
-# Track active instances
-active_instances = {INSTANCE_ID: asyncio.get_event_loop().time()}
+guild_prefixes, guild_channels = load_guild_config()
 
-@bot.event
-async def on_ready():
-    print(f'{bot.user} has logged in! Instance: {INSTANCE_ID}')
-    print(f'Loaded {len(runes_data)} runes')
+def get_prefix(bot, message):
+    return guild_prefixes.get(message.guild.id if message.guild else None, DEFAULT_PREFIXES)
+
+# Sharding: 'none' (one gateway connection), 'auto' (AutoShardedBot in this
+# process) or 'process' (a supervisor runs one bot process per shard range)
+SHARD_MODE = os.environ.get('SHARD_MODE', 'none')
+SHARD_COUNT = int(os.environ['SHARD_COUNT']) if os.environ.get('SHARD_COUNT') else None
+SHARD_IDS = [int(shard_id) for shard_id in os.environ['SHARD_IDS'].split(',')] if os.environ.get('SHARD_IDS') else None
+SHARD_WORKERS = int(os.environ.get('SHARD_WORKERS', 2))
+# Set by the supervisor for its workers
+SHARD_WORKER = int(os.environ.get('SHARD_WORKER', 0))
+SHARD_STATUS_DIR = os.environ.get('SHARD_STATUS_DIR')
+
+class LeaderCommandTree(app_commands.CommandTree):
+    """Slash command tree that only answers interactions on the leader instance"""
+    
+    async def interaction_check(self, interaction):
+        # Every instance receives the interaction, but only one may acknowledge it
+        if not leader.is_leader:
+            return False
+        if interaction.type is discord.InteractionType.autocomplete:
+            return True
+        
+        refused = rate_limits.check(interaction.user.id, interaction.channel_id, interaction.guild_id)
+        if refused is not None:
+            limit, bucket = refused
+            await interaction.response.send_message(
+                f"Slow down! Try again in {math.ceil(limit.retry_after(bucket))}s.", ephemeral=True)
+            return False
+        
+        # The command runs in this task, so its timed() phases land in this timer
+        timer = PhaseTimer()
+        command_phases.set(timer)
+        interaction.extras['phases'] = timer
+        interaction.extras['started'] = time.perf_counter()
+        return True
     
-    # Register this instance as active
-    active_instances[INSTANCE_ID] = asyncio.get_event_loop().time()
+    async def on_error(self, interaction, error):
+        record_slash_command(interaction, interaction.command, failed=True)
+        await super().on_error(interaction, error)
 
-@bot.event
-async def on_message(message):
-    # Prevent bot from responding to itself
-    if message.author == bot.user:
-        return
+def create_bot():
+    """Bot instance for the configured shard mode"""
+    if SHARD_MODE == 'none':
+        return commands.Bot(command_prefix=get_prefix, intents=intents, tree_cls=LeaderCommandTree)
+    shard_options = {}
+    if SHARD_COUNT:
+        shard_options['shard_count'] = SHARD_COUNT
+    if SHARD_IDS is not None:
+        shard_options['shard_ids'] = SHARD_IDS
+    return commands.AutoShardedBot(command_prefix=get_prefix, intents=intents, tree_cls=LeaderCommandTree, **shard_options)
+
+bot = create_bot()
+
+# Metrics, exposed in Prometheus text format on /metrics
+
+# Latency histogram bucket bounds, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets"""
     
-    # Only process messages if this is the most recent instance
-    current_time = asyncio.get_event_loop().time()
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
     
-    # Clean up old instances (older than 60 seconds)
-    expired_instances = []
-    for instance_id, start_time in active_instances.items():
-        if current_time - start_time > 60:
-            expired_instances.append(instance_id)
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+class Metrics:
+    """In-process counters and histograms keyed by metric name and labels"""
     
-    for expired in expired_instances:
-        del active_instances[expired]
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.help = {}
     
-    # Only process if this is the most recent instance
-    if active_instances:
-        most_recent_instance = max(active_instances.keys(), key=lambda x: active_instances[x])
-        if INSTANCE_ID != most_recent_instance:
-            return
+    def describe(self, name, kind, text):
+        self.help[name] = (kind, text)
     
-    # Process commands
-    await bot.process_commands(message)
-
-# Function to parse the Excel file and extract rune data
-def load_runes_from_excel():
-    runes = {}
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + amount
     
-    try:
-        # Check if file exists
-        if not os.path.exists('BROT13.xlsx'):
-            print("ERROR: BROT13.xlsx file not found!")
-            return {}
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+    
+    def render(self, gauges=()):
+        """Prometheus text exposition of all metrics plus the given (name, labels, value) gauges"""
+        lines = []
+        described = set()
         
-        print("Loading runes from BROT13.xlsx...")
-        df = pd.read_excel('BROT13.xlsx', sheet_name='Better Rune Order (T13 Late Gam', header=None)
-        print(f"Successfully loaded Excel file with {len(df)} rows")
+        def header(name):
+            if name not in described and name in self.help:
+                kind, text = self.help[name]
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+                described.add(name)
         
-        # Parse the data to extract rune information
-        current_category = ""
+        for (name, labels), value in sorted(list(self.counters.items())):
+            header(name)
+            lines.append(f"{name}{format_labels(labels)} {value}")
         
-        for index, row in df.iterrows():
-            # Skip empty rows
-            if row.isna().all():
-                continue
-                
-            # Convert row to list and filter out NaN values
-            row_data = [str(cell) for cell in row if pd.notna(cell)]
-            
-            # Look for category headers (rows that contain "Rune:")
-            for cell in row_data:
-                if "Rune:" in cell and not cell.startswith("http"):
-                    current_category = cell.strip()
-                    break
-            
-            # Look for rune entries (cells that contain rarity patterns like "1/")
-            for cell in row_data:
-                if "1/" in cell and not cell.startswith("http"):
-                    # Extract rune name and rarity
-                    # Pattern: (rarity) RuneName or Rarity RuneName
-                    match = re.search(r'[([]?(1/[\d.]+[A-Za-z]*)[)\]]?\s+([A-Za-z\s]+)', cell)
-                    if match:
-                        rarity = match.group(1)
-                        rune_name = match.group(2).strip()
-                        
-                        # Get stats from the next row if available
-                        stats = "Stats not found in spreadsheet"
-                        if index + 1 < len(df):
-                            next_row = df.iloc[index + 1]
-                            next_row_data = [str(cell) for cell in next_row if pd.notna(cell)]
-                            if next_row_data:
-                                # Look for stats in the same column or nearby
-                                for next_cell in next_row_data:
-                                    if "Stats:" in next_cell or ("x" in next_cell and len(next_cell) > 10):
-                                        stats = next_cell.replace("Stats:", "").strip()
-                                        break
-                        
-                        runes[rune_name] = {
-                            "rarity": rarity,
-                            "category": current_category if current_category else "Unknown",
-                            "stats": stats
-                        }
-                    
-        print(f"Loaded {len(runes)} runes from spreadsheet")
-        return runes
-    
-    except Exception as e:
-        print(f"Error loading runes from Excel: {e}")
-        # Return sample data if Excel parsing fails
-        return {
-            "Bloom": {
-                "rarity": "1/7.5B",
-                "category": "Color Rune",
-                "stats": "1k Boost Spheres [No Limit] + Talent Upgrade (Prisms Talent Tree)"
-            },
-            "Mystery": {
-                "rarity": "1/1T",
-                "category": "Basic Rune",
-                "stats": "x1 Rune Bulk (MAX x5) + -0.1s RToken Cooldown (MAX -60s)"
-            }
-        }
+        for (name, labels), histogram in sorted(list(self.histograms.items()), key=lambda item: item[0]):
+            header(name)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float('inf'),), list(histogram.counts)):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum}")
+            lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+        
+        for name, labels, value in gauges:
+            header(name)
+            lines.append(f"{name}{format_labels(tuple(sorted(labels.items())))} {value}")
+        
+        return "\n".join(lines) + "\n"
 
-# Load runes when bot starts
-runes_data = load_runes_from_excel()
+metrics = Metrics()
+metrics.describe("bot_messages_processed_total", "counter", "Messages passed to the command framework")
+metrics.describe("bot_command_invocations_total", "counter", "Command invocations")
+metrics.describe("bot_command_errors_total", "counter", "Command invocations that raised an error")
+metrics.describe("bot_command_phase_seconds", "histogram", "Time spent per command phase (parse, lookup, embed, send, total)")
+metrics.describe("bot_rune_reloads_total", "counter", "Rune data loads that swapped in a new snapshot")
+metrics.describe("bot_rune_load_seconds", "gauge", "Time the current rune data took to load")
+metrics.describe("bot_rune_data_version", "gauge", "Version of the rune data currently served")
+metrics.describe("bot_runes", "gauge", "Number of runes in the current data, per tier")
+metrics.describe("bot_response_cache_hits_total", "counter", "Command responses served from the response cache")
+metrics.describe("bot_response_cache_misses_total", "counter", "Command responses that had to be built")
+metrics.describe("bot_response_cache_entries", "gauge", "Responses currently held in the response cache")
+metrics.describe("bot_gateway_latency_seconds", "gauge", "Discord gateway heartbeat latency")
+metrics.describe("bot_guilds", "gauge", "Guilds the bot is in")
+metrics.describe("bot_is_leader", "gauge", "Whether this instance holds the leader lease")
+metrics.describe("bot_live_result_views", "gauge", "Paginated result messages whose buttons still respond")
+metrics.describe("bot_rate_limited_total", "counter", "Commands refused by a rate limit")
+metrics.describe("bot_rate_limit_capacity", "gauge", "Commands allowed in a burst, per rate limit scope")
+metrics.describe("bot_rate_limit_period_seconds", "gauge", "Seconds for a rate limit bucket to refill completely")
+metrics.describe("bot_coalesced_total", "counter", "Commands skipped because the same query in the channel was already being answered")
+metrics.describe("bot_send_queue_depth", "gauge", "Outbound messages waiting in the per-channel send queues")
+metrics.describe("bot_send_queue_wait_seconds", "histogram", "Time outbound messages waited in their channel's send queue")
+metrics.describe("bot_api_requests_total", "counter", "JSON API requests, per endpoint and response status")
 
-# Remove default help command to prevent duplicates
-bot.remove_command('help')
+class PhaseTimer:
+    """Exclusive time per phase for one command invocation"""
+    
+    def __init__(self):
+        self.totals = {}
+        # Time spent in nested phases, per open phase
+        self.nested = []
 
-@bot.command(name='ping')
-async def ping(ctx):
-    """Check if the bot is responsive"""
-    latency = bot.latency * 1000  # Convert to milliseconds
-    await ctx.send(f'Pong! Latency: {latency:.2f}ms (Instance: {INSTANCE_ID})')
+# Phase timer of the command currently being handled (set per invocation)
+command_phases = contextvars.ContextVar('command_phases', default=None)
 
-@bot.command(name='rune')
-async def get_rune_info(ctx, *, rune_name: str):
-    """Get information about a specific rune"""
-    # Try to find the rune (case insensitive)
-    rune_info = None
-    found_name = None
-    
-    for name, info in runes_data.items():
-        if name.lower() == rune_name.lower():
-            rune_info = info
-            found_name = name
-            break
-        elif rune_name.lower() in name.lower():
-            rune_info = info
-            found_name = name
-            break
-    
-    if not rune_info:
-        # Try partial match
-        for name, info in runes_data.items():
-            if rune_name.lower() in name.lower():
-                rune_info = info
-                found_name = name
-                break
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to the current command's phase timings
     
-    if not rune_info:
-        await ctx.send(f"Rune '{rune_name}' not found. Try another name!")
+    Time spent in a nested timed block only counts towards the inner phase."""
+    timer = command_phases.get()
+    if timer is None:
+        yield
         return
     
-    # Create embed response
-    embed = discord.Embed(
-        title=f"{found_name} Rune",
-        color=discord.Color.blue()
-    )
+    timer.nested.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = timer.nested.pop()
+        timer.totals[phase] = timer.totals.get(phase, 0.0) + elapsed - nested
+        if timer.nested:
+            timer.nested[-1] += elapsed
+
+# Dispatch: rate limits, coalescing of identical queries and per-channel priority
+# send queues, so a burst of the same command after an update costs one lookup and one send
+
+def parse_rate_limit(text):
+    """(capacity, period in seconds) for a limit like '5/10', or None for '0' or empty"""
+    if not text or text.strip() == '0':
+        return None
+    capacity, _, period = text.partition('/')
+    return int(capacity), float(period or 60)
+
+# Commands per period, as 'count/seconds', per user, channel and guild; '0' disables a limit
+RATE_LIMIT_USER = parse_rate_limit(os.environ.get('RATE_LIMIT_USER', '5/10'))
+RATE_LIMIT_CHANNEL = parse_rate_limit(os.environ.get('RATE_LIMIT_CHANNEL', '20/10'))
+RATE_LIMIT_GUILD = parse_rate_limit(os.environ.get('RATE_LIMIT_GUILD', '60/10'))
+
+# Send priorities, lowest first
+PRIORITY_RESPONSE = 0
+PRIORITY_NOTICE = 1
+
+class TokenBucket:
+    """Tokens left for one user, channel or guild"""
     
-    embed.add_field(name="Rarity", value=rune_info.get("rarity", "N/A"), inline=True)
-    embed.add_field(name="Category", value=rune_info.get("category", "N/A"), inline=True)
-    embed.add_field(name="Stats", value=rune_info.get("stats", "N/A"), inline=False)
+    __slots__ = ('tokens', 'updated', 'warned_until')
     
-    await ctx.send(embed=embed)
+    def __init__(self, tokens, now):
+        self.tokens = tokens
+        self.updated = now
+        self.warned_until = 0.0
 
-@bot.command(name='runes')
-async def list_runes(ctx):
-    """List all available runes"""
-    if not runes_data:
-        await ctx.send("No runes data available.")
-        return
-        
-    rune_list = "\n".join([f"• {name} ({info.get('rarity', 'N/A')})" for name, info in list(runes_data.items())[:20]])
+class RateLimit:
+    """Token buckets for one scope, refilling capacity tokens every period seconds"""
     
-    embed = discord.Embed(
-        title="Available Runes (First 20)",
-        description=rune_list,
-        color=discord.Color.green()
-    )
+    # Buckets kept per scope; idle ones are full again and can be forgotten
+    MAX_BUCKETS = 10000
     
-    await ctx.send(embed=embed)
+    def __init__(self, scope, capacity, period):
+        self.scope = scope
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.buckets = OrderedDict()
+    
+    def bucket(self, key, now):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.capacity, now)
+            if len(self.buckets) > self.MAX_BUCKETS:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+            bucket.tokens = min(self.capacity, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+        return bucket
+    
+    def retry_after(self, bucket):
+        return (1 - bucket.tokens) / self.rate
 
-@bot.command(name='category')
-async def list_category_runes(ctx, *, category: str):
-    """List runes by category"""
-    category_runes = []
-    category_lower = category.lower()
+class RateLimits:
+    """Per-user, per-channel and per-guild rate limits, checked together"""
     
-    for name, info in runes_data.items():
-        if info.get("category", "").lower() == category_lower:
-            category_runes.append(f"• {name} ({info.get('rarity', 'N/A')})")
+    def __init__(self, user, channel, guild):
+        self.scopes = {
+            scope: RateLimit(scope, *limit) if limit else None
+            for scope, limit in (("user", user), ("channel", channel), ("guild", guild))
+        }
     
-    if not category_runes:
-        await ctx.send(f"No runes found in category '{category}'")
-        return
+    def limits(self):
+        return [limit for limit in self.scopes.values() if limit is not None]
+    
+    def check(self, user_id, channel_id, guild_id):
+        """Take a token from every bucket the command counts against
+        
+        Returns None if the command may run, else the refusing (limit, bucket); nothing is taken then."""
+        now = time.monotonic()
+        taken = []
+        for scope, key in (("user", user_id), ("channel", channel_id), ("guild", guild_id)):
+            limit = self.scopes[scope]
+            if limit is None or key is None:
+                continue
+            bucket = limit.bucket(key, now)
+            if bucket.tokens < 1:
+                metrics.inc("bot_rate_limited_total", scope=scope)
+                return limit, bucket
+            taken.append(bucket)
+        for bucket in taken:
+            bucket.tokens -= 1
+        return None
+
+rate_limits = RateLimits(RATE_LIMIT_USER, RATE_LIMIT_CHANNEL, RATE_LIMIT_GUILD)
+
+class QueryCoalescer:
+    """Tracks queries being answered per channel, so identical ones arriving meanwhile are skipped
     
-    rune_list = "\n".join(category_runes)
+    Only while the first one is in flight: its answer is about to appear in the
+    channel. A query repeated after that is answered again."""
     
-    embed = discord.Embed(
-        title=f"{category} Runes",
-        description=rune_list,
-        color=discord.Color.purple()
-    )
+    def __init__(self):
+        self.in_flight = set()
     
-    await ctx.send(embed=embed)
+    def claim(self, key):
+        """True if the caller should answer the query, False if it is already being answered"""
+        if key in self.in_flight:
+            return False
+        self.in_flight.add(key)
+        return True
+    
+    def release(self, key):
+        self.in_flight.discard(key)
 
-@bot.command(name='search')
-async def search_runes(ctx, *, query: str):
-    """Search for runes by name or rarity"""
-    matching_runes = []
-    query_lower = query.lower()
+coalescer = QueryCoalescer()
+
+class SendQueue:
+    """Outbound Discord sends, queued per channel and sent one at a time in priority order
     
-    for name, info in runes_data.items():
-        if (query_lower in name.lower() or 
-            query_lower in info.get("rarity", "").lower() or
-            query_lower in info.get("category", "").lower()):
-            matching_runes.append(f"• {name} ({info.get('rarity', 'N/A')}) - {info.get('category', 'N/A')}")
+    Discord rate limits sends per channel, so while one channel waits out a 429
+    only its own messages wait; once it frees up its queued command responses go
+    out before notices. A channel's worker exits when its queue runs empty."""
     
-    if not matching_runes:
-        await ctx.send(f"No runes found matching '{query}'")
-        return
+    def __init__(self):
+        self.queues = {}
+        # Running worker per channel, referenced so it isn't garbage collected
+        self.workers = {}
+        self.order = itertools.count()
     
-    # Limit to first 10 results
-    rune_list = "\n".join(matching_runes[:10])
+    def depth(self):
+        return sum(queue.qsize() for queue in self.queues.values())
     
-    embed = discord.Embed(
-        title=f"Search Results for '{query}'",
-        description=rune_list,
-        color=discord.Color.orange()
-    )
+    async def submit(self, channel_id, send, priority=PRIORITY_RESPONSE):
+        """Run send() on the channel's worker and return its result"""
+        queue = self.queues.get(channel_id)
+        if queue is None:
+            queue = self.queues[channel_id] = asyncio.PriorityQueue()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((priority, next(self.order), time.monotonic(), send, future))
+        if channel_id not in self.workers:
+            self.workers[channel_id] = asyncio.create_task(self.work(channel_id, queue))
+        return await future
     
-    await ctx.send(embed=embed)
+    async def work(self, channel_id, queue):
+        try:
+            while not queue.empty():
+                priority, _, queued_at, send, future = queue.get_nowait()
+                metrics.observe("bot_send_queue_wait_seconds", time.monotonic() - queued_at, priority=str(priority))
+                if future.cancelled():
+                    continue
+                try:
+                    result = await send()
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            # Nothing awaits between the empty check and here, so no send can be left behind
+            del self.workers[channel_id]
+            del self.queues[channel_id]
 
+send_queue = SendQueue()
 
-@bot.command(name='latest')
-async def latest_runes(ctx):
-    """Show the latest recommended runes from the spreadsheet"""
-    if not runes_data:
-        await ctx.send("No runes data available.")
-        return
-    
-    # Get runes from the "Recommended" section (first few rows)
-    recommended_runes = [
-        "Bloom", "Vexed", "Blizzard", "Aether", "Kingslayer", 
-        "Mystery", "Thorn", "Divinity", "Abyssium", "Prosperity"
-    ]
+class InstrumentedContext(commands.Context):
+    """Command context that times Discord sends and passes them through its channel's send queue"""
     
-    rune_list = []
-    for rune_name in recommended_runes[:8]:  # Show first 8
-        if rune_name in runes_data:
-            rarity = runes_data[rune_name].get("rarity", "N/A")
-            rune_list.append(f"• **{rune_name}** ({rarity})")
+    async def send(self, *args, **kwargs):
+        with timed('send'):
+            return await send_queue.submit(self.channel.id, lambda: super(InstrumentedContext, self).send(*args, **kwargs))
+
+async def process_commands(message):
+    """Like bot.process_commands, but recording per-command metrics"""
+    if message.author.bot:
+        return
+    metrics.inc("bot_messages_processed_total")
     
-    if not rune_list:
-        await ctx.send("Could not load recommended runes.")
+    timer = PhaseTimer()
+    command_phases.set(timer)
+    start = time.perf_counter()
+    with timed('parse'):
+        ctx = await bot.get_context(message, cls=InstrumentedContext)
+    if ctx.command is None:
         return
     
-    embed = discord.Embed(
-        title="📈 Latest Recommended Runes",
-        description="Top priority runes to grind:\n" + "\n".join(rune_list),
-        color=discord.Color.teal()
-    )
+    refused = rate_limits.check(message.author.id, message.channel.id, message.guild.id if message.guild else None)
+    if refused is not None:
+        limit, bucket = refused
+        now = time.monotonic()
+        # Tell a user they are going too fast once per period, not on every message
+        if limit.scope == "user" and now >= bucket.warned_until:
+            bucket.warned_until = now + limit.period
+            notice = f"Slow down, {message.author.display_name}! Try again in {math.ceil(limit.retry_after(bucket))}s."
+            await send_queue.submit(message.channel.id, lambda: message.channel.send(notice), PRIORITY_NOTICE)
+        return
     
-    embed.set_footer(text="Based on current T13 late game progression")
+    await bot.invoke(ctx)
+    timer.totals['total'] = time.perf_counter() - start
     
-    await ctx.send(embed=embed)
+    command = ctx.command.qualified_name
+    metrics.inc("bot_command_invocations_total", command=command)
+    if ctx.command_failed:
+        metrics.inc("bot_command_errors_total", command=command)
+    for phase, seconds in timer.totals.items():
+        metrics.observe("bot_command_phase_seconds", seconds, command=command, phase=phase)
 
+def record_slash_command(interaction, command, failed=False):
+    """Record a finished slash command like process_commands does for prefix commands"""
+    name = f"/{command.qualified_name}" if command is not None else "/unknown"
+    metrics.inc("bot_command_invocations_total", command=name)
+    if failed:
+        metrics.inc("bot_command_errors_total", command=name)
+    timer = interaction.extras.get('phases')
+    if timer is None:
+        return
+    timer.totals['total'] = time.perf_counter() - interaction.extras['started']
+    for phase, seconds in timer.totals.items():
+        metrics.observe("bot_command_phase_seconds", seconds, command=name, phase=phase)
 
+def metrics_text():
+    """Everything on /metrics, including point-in-time gauges"""
+    snapshot = rune_snapshot
+    gauges = [
+        ("bot_response_cache_hits_total", {}, response_cache.hits),
+        ("bot_response_cache_misses_total", {}, response_cache.misses),
+        ("bot_response_cache_entries", {}, len(response_cache.entries)),
+        ("bot_guilds", {}, len(bot.guilds)),
+        ("bot_is_leader", {}, int(leader.is_leader)),
+        ("bot_live_result_views", {}, len(live_views.views)),
+        ("bot_send_queue_depth", {}, send_queue.depth()),
+    ]
+    for limit in rate_limits.limits():
+        gauges.append(("bot_rate_limit_capacity", {"scope": limit.scope}, limit.capacity))
+        gauges.append(("bot_rate_limit_period_seconds", {"scope": limit.scope}, limit.period))
+    if math.isfinite(bot.latency):
+        gauges.append(("bot_gateway_latency_seconds", {}, bot.latency))
+    if snapshot is not None:
+        gauges.append(("bot_rune_load_seconds", {}, snapshot.load_seconds))
+        gauges.append(("bot_rune_data_version", {}, snapshot.version))
+        for tier in snapshot.tiers.values():
+            gauges.append(("bot_runes", {"tier": tier.name}, len(tier.runes)))
+    return metrics.render(gauges)
 
-    # Bot version
-BOT_VERSION = "1.2.0"
+# Leader election: only the instance holding the lease answers commands, so two
+# instances overlapping during a deploy don't both reply. A newer instance takes
+# the lease over from an older one, an expired lease is free for anyone.
 
-def load_changelog():
-    """Load changelog data from file"""
-    try:
-        with open('changelog.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Return default changelog if file doesn't exist
-        return {
-            "version": BOT_VERSION,
-            "last_updated": datetime.now().strftime("%Y-%m-%d"),
-            "changes": [{
-                "version": BOT_VERSION,
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "features": ["Initial changelog system"],
-                "fixes": []
-            }]
-        }
+# 'sqlite' (instances sharing a disk), 'redis' (REDIS_URL) or 'none'
+LEADER_BACKEND = os.environ.get('LEADER_BACKEND', 'redis' if os.environ.get('REDIS_URL') else 'sqlite')
+LEADER_LOCK_FILE = os.environ.get('LEADER_LOCK_FILE', 'leader.sqlite3')
+LEADER_KEY = os.environ.get('LEADER_KEY', 'ascenders-bot:leader')
+if SHARD_IDS is not None:
+    # Each shard range elects its own leader
+    LEADER_KEY += ":shards-" + "-".join(map(str, SHARD_IDS))
+LEADER_LEASE_SECONDS = float(os.environ.get('LEADER_LEASE_SECONDS', 30))
+# Wall clock start time, comparable between hosts to tell which instance is newer
+INSTANCE_STARTED_AT = time.time()
 
-@bot.command(name='version')
-async def show_version(ctx):
-    """Show bot version information"""
-    changelog = load_changelog()
+# try_acquire results: refused, taken or renewed, or taken over from a live older holder
+LEASE_REFUSED = 0
+LEASE_ACQUIRED = 1
+LEASE_TAKEN_OVER = 2
+
+class SQLiteLeaseBackend:
+    """Lease stored in a local SQLite file"""
     
-    embed = discord.Embed(
-        title="Ascenders Bot Version",
-        color=discord.Color.blue()
-    )
+    def __init__(self, path):
+        self.path = path
     
-    embed.add_field(name="Version", value=f"`v{changelog['version']}`", inline=True)
-    embed.add_field(name="Last Updated", value=changelog['last_updated'], inline=True)
-    embed.add_field(name="Instance ID", value=f"`{INSTANCE_ID}`", inline=False)
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, holder TEXT, started_at REAL, expires_at REAL)")
+        return conn
     
-    await ctx.send(embed=embed)
+    def try_acquire(self, key, holder, started_at, ttl):
+        """Take or renew the lease: LEASE_REFUSED if another live, newer instance holds it,
+        LEASE_TAKEN_OVER if a live, older one did, else LEASE_ACQUIRED"""
+        now = time.time()
+        with closing(self.connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT holder, started_at, expires_at FROM leases WHERE key = ?", (key,)).fetchone()
+            live_other = row is not None and row[0] != holder and row[2] > now
+            if live_other and row[1] >= started_at:
+                conn.execute("COMMIT")
+                return LEASE_REFUSED
+            conn.execute("INSERT OR REPLACE INTO leases (key, holder, started_at, expires_at) VALUES (?, ?, ?, ?)",
+                         (key, holder, started_at, now + ttl))
+            conn.execute("COMMIT")
+            return LEASE_TAKEN_OVER if live_other else LEASE_ACQUIRED
+    
+    def release(self, key, holder, started_at):
+        with closing(self.connect()) as conn:
+            conn.execute("DELETE FROM leases WHERE key = ? AND holder = ?", (key, holder))
 
-@bot.command(name='changelog')
-async def show_changelog(ctx, version: str = None):
-    """Show changelog information"""
-    changelog = load_changelog()
+class RedisLeaseBackend:
+    """Lease stored in Redis, or anything that speaks its protocol and runs Lua scripts"""
     
-    if version:
-        # Show specific version
-        for change in changelog['changes']:
-            if change['version'] == version:
-                embed = discord.Embed(
-                    title=f"Changelog - Version {version}",
-                    color=discord.Color.green()
-                )
-                embed.add_field(name="Date", value=change['date'], inline=False)
-                
-                if change['features']:
-                    features = "\n".join([f"• {feature}" for feature in change['features']])
-                    embed.add_field(name="New Features", value=features, inline=False)
-                
-                if change['fixes']:
-                    fixes = "\n".join([f"• {fix}" for fix in change['fixes']])
-                    embed.add_field(name="Bug Fixes", value=fixes, inline=False)
-                
-                await ctx.send(embed=embed)
-                return
-        
-        await ctx.send(f"Version `{version}` not found in changelog.")
-        return
+    # Lease value is "<started_at>:<holder>"; the key's TTL is the lease expiry.
+    # A value not in that format is taken over.
+    ACQUIRE_SCRIPT = """
+local result = 1
+local current = redis.call('GET', KEYS[1])
+if current then
+    local sep = string.find(current, ':', 1, true)
+    local started_at = sep and tonumber(string.sub(current, 1, sep - 1))
+    if started_at then
+        local holder = string.sub(current, sep + 1)
+        if holder ~= ARGV[2] then
+            if started_at >= tonumber(ARGV[1]) then
+                return 0
+            end
+            result = 2
+        end
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1] .. ':' .. ARGV[2], 'PX', ARGV[3])
+return result
+"""
+    RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
     
-    # Show latest changes
-    latest = changelog['changes'][0]
-    embed = discord.Embed(
-        title="Latest Changes",
-        color=discord.Color.gold()
-    )
+    def __init__(self, client):
+        self.client = client
     
-    embed.add_field(name="Version", value=f"`v{latest['version']}`", inline=True)
-    embed.add_field(name="Date", value=latest['date'], inline=True)
+    def try_acquire(self, key, holder, started_at, ttl):
+        """Take or renew the lease, returning LEASE_REFUSED, LEASE_ACQUIRED or LEASE_TAKEN_OVER"""
+        return int(self.client.eval(self.ACQUIRE_SCRIPT, 1, key, repr(started_at), holder, int(ttl * 1000)))
     
-    if latest['features']:
-        features = "\n".join([f"• {feature}" for feature in latest['features']])
-        embed.add_field(name="New Features", value=features, inline=False)
+    def release(self, key, holder, started_at):
+        self.client.eval(self.RELEASE_SCRIPT, 1, key, f"{started_at!r}:{holder}")
+
+def create_lease_backend():
+    """Lease backend selected by LEADER_BACKEND, or None to always lead"""
+    if LEADER_BACKEND == 'redis':
+        try:
+            import redis
+        except ImportError:
+            print("ERROR: LEADER_BACKEND is redis but the redis package isn't installed "
+                  "(pip install redis), falling back to the sqlite lease")
+        else:
+            return RedisLeaseBackend(redis.Redis.from_url(os.environ['REDIS_URL']))
+        return SQLiteLeaseBackend(LEADER_LOCK_FILE)
+    if LEADER_BACKEND == 'sqlite':
+        return SQLiteLeaseBackend(LEADER_LOCK_FILE)
+    return None
+
+class LeaderElection:
+    """Holds and renews the leadership lease on a background timer
+    
+    on_message only reads is_leader; all backend calls happen in the renewal loop."""
+    
+    def __init__(self, backend, key, holder, started_at, lease_seconds):
+        self.backend = backend
+        self.key = key
+        self.holder = holder
+        self.started_at = started_at
+        self.lease_seconds = lease_seconds
+        # Without a backend there is nobody to coordinate with
+        self.is_leader = backend is None
+        self.lease_expires = 0.0
+        # After taking the lease over from a live leader, don't lead before this time:
+        # the old leader only notices on its next renewal
+        self.leading_from = 0.0
+        self.handover_seconds = lease_seconds / 3 * 1.25
+        self.task = None
+    
+    def renew(self):
+        """Try to take or renew the lease once (blocking)"""
+        requested = time.monotonic()
+        try:
+            acquired = self.backend.try_acquire(self.key, self.holder, self.started_at, self.lease_seconds)
+        except Exception as e:
+            print(f"Leader lease renewal failed: {e}")
+            # Keep leading only while the last lease we got is still valid
+            acquired = None
+        
+        if acquired == LEASE_TAKEN_OVER:
+            self.leading_from = requested + self.handover_seconds
+        if acquired:
+            self.lease_expires = requested + self.lease_seconds
+        was_leader = self.is_leader
+        now = time.monotonic()
+        holds_lease = bool(acquired) or (acquired is None and now < self.lease_expires)
+        self.is_leader = holds_lease and now >= self.leading_from
+        if self.is_leader != was_leader:
+            print(f"Instance {self.holder} {'is now the leader' if self.is_leader else 'lost leadership'}")
+    
+    async def run(self):
+        while True:
+            await asyncio.to_thread(self.renew)
+            delay = self.lease_seconds / 3
+            if not self.is_leader and self.leading_from > time.monotonic():
+                # Renew, and start leading, as soon as the handover wait is over
+                delay = min(delay, self.leading_from - time.monotonic())
+            await asyncio.sleep(delay)
+    
+    def start(self):
+        if self.backend is not None and self.task is None:
+            self.task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        """Stop renewing and hand the lease over right away"""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        if self.backend is not None and self.is_leader:
+            self.is_leader = False
+            try:
+                await asyncio.to_thread(self.backend.release, self.key, self.holder, self.started_at)
+            except Exception as e:
+                print(f"Could not release leader lease: {e}")
+
+leader = LeaderElection(create_lease_backend(), LEADER_KEY, INSTANCE_ID, INSTANCE_STARTED_AT, LEADER_LEASE_SECONDS)
+
+# Register the slash commands with Discord on startup (otherwise use !sync)
+SYNC_SLASH_COMMANDS = os.environ.get('SYNC_SLASH_COMMANDS') == '1'
+
+@bot.event
+async def setup_hook():
+    global rune_load_task
+    # Parse the rune data while the gateway connects instead of before it
+    rune_load_task = asyncio.create_task(load_initial_runes())
+    leader.start()
+    if SHARD_STATUS_DIR:
+        publish_shard_status.start()
+    if SYNC_SLASH_COMMANDS:
+        synced = await bot.tree.sync()
+        print(f"Synced {len(synced)} slash commands")
+
+@bot.event
+async def on_app_command_completion(interaction, command):
+    record_slash_command(interaction, command)
+
+@bot.event
+async def on_ready():
+    print(f'{bot.user} has logged in! Instance: {INSTANCE_ID}')
+    if rune_snapshot is not None:
+        print(f'Loaded {rune_snapshot.rune_count} runes in {len(rune_snapshot.tiers)} tiers in {rune_snapshot.load_seconds * 1000:.1f}ms')
+    else:
+        print(f'Rune data still loading ({time.monotonic() - BOOT_TIME:.1f}s since start)')
+
+@bot.event
+async def on_command_completion(ctx):
+    if startup_timings["first_response_after_s"] is None:
+        startup_timings["first_response_after_s"] = round(time.monotonic() - BOOT_TIME, 3)
+        print(f"First command answered {startup_timings['first_response_after_s']}s after start")
+
+def may_be_command(message):
+    """Whether a message passes the cheap pre-filter and may hold a command for this bot"""
+    # Cheapest checks first: most messages are chatter that never reaches a command
+    # Ignore bots, including this one
+    if message.author.bot:
+        return False
+    
+    guild_id = message.guild.id if message.guild else None
+    if not message.content.startswith(guild_prefixes.get(guild_id, DEFAULT_PREFIXES)):
+        return False
+    
+    allowed_channels = guild_channels.get(guild_id)
+    if allowed_channels is not None and message.channel.id not in allowed_channels and \
+            getattr(message.channel, 'parent_id', None) not in allowed_channels:
+        return False
+    return True
+
+@bot.event
+async def on_message(message):
+    if not may_be_command(message):
+        return
+    
+    # Only process messages if this instance holds the leader lease
+    if not leader.is_leader:
+        return
+    
+    # Process commands
+    await process_commands(message)
+
+# Workbooks searched for rune order sheets (comma-separated globs); every sheet is one tier
+RUNES_WORKBOOKS = os.environ.get('RUNES_WORKBOOKS', 'BROT*.xlsx')
+RUNE_ORDER_SHEET_PATTERN = re.compile(r'rune order', re.IGNORECASE)
+# Tier of a sheet, from its title like '(T13 Late Gam' or else its workbook's name like BROT13
+TIER_PATTERN = re.compile(r'\bT(\d+)\b')
+# Workbooks smaller than this in total are parsed serially: starting the pool's worker
+# processes takes longer than parsing a few small workbooks
+RUNES_POOL_MIN_BYTES = int(os.environ.get('RUNES_POOL_MIN_BYTES', 8 * 1024 * 1024))
+
+# Compiled snapshot of the parsed runes, keyed by the spreadsheet hash
+RUNES_SNAPSHOT_FILE = 'runes_snapshot.json'
+SNAPSHOT_FORMAT = 2
+
+# Sample data used if Excel parsing fails
+SAMPLE_RUNES = {
+    "Bloom": {
+        "rarity": "1/7.5B",
+        "category": "Color Rune",
+        "stats": "1k Boost Spheres [No Limit] + Talent Upgrade (Prisms Talent Tree)"
+    },
+    "Mystery": {
+        "rarity": "1/1T",
+        "category": "Basic Rune",
+        "stats": "x1 Rune Bulk (MAX x5) + -0.1s RToken Cooldown (MAX -60s)"
+    }
+}
+
+# Set for shard workers: load runes only from the snapshot compiled by the supervisor
+RUNES_SNAPSHOT_ONLY = os.environ.get('RUNES_SNAPSHOT_ONLY') == '1'
+
+def tier_name(path, sheet):
+    """Tier a rune order sheet covers, like T13"""
+    match = TIER_PATTERN.search(sheet) or re.search(r'(\d+)', os.path.splitext(os.path.basename(path))[0])
+    return f"T{match.group(1)}" if match else sheet.strip()
+
+# Tier the commands use unless given tier:
+DEFAULT_TIER = os.environ.get('DEFAULT_TIER') or tier_name(RUNES_FILE, RUNES_SHEET)
+
+def tier_sort_key(tier):
+    match = re.fullmatch(r'T(\d+)', tier)
+    return (0, int(match.group(1)), tier) if match else (1, 0, tier)
+
+def workbook_paths():
+    """Workbooks matching RUNES_WORKBOOKS, in sorted order"""
+    paths = set()
+    for pattern in RUNES_WORKBOOKS.split(','):
+        paths.update(glob.glob(pattern.strip()))
+    return sorted(paths)
+
+def workbook_sheet_names(path):
+    """Sheet names of a workbook, read from its index without loading any sheet"""
+    try:
+        with zipfile.ZipFile(path) as workbook:
+            index = workbook.read('xl/workbook.xml').decode('utf-8')
+    except (OSError, KeyError, zipfile.BadZipFile) as e:
+        print(f"Skipping unreadable workbook {path}: {e}")
+        return []
+    return [html.unescape(name) for name in re.findall(r'<sheet\b[^>]*?\bname="([^"]*)"', index)]
+
+def find_rune_sheets():
+    """(tier, workbook path, sheet) for every rune order sheet, by tier"""
+    sheets = {}
+    for path in workbook_paths():
+        for sheet in workbook_sheet_names(path):
+            if not RUNE_ORDER_SHEET_PATTERN.search(sheet):
+                continue
+            tier = tier_name(path, sheet)
+            if tier in sheets:
+                print(f"Ignoring sheet '{sheet}' in {path}: tier {tier} already comes from {sheets[tier][0]}")
+                continue
+            sheets[tier] = (path, sheet)
+    return [(tier, path, sheet) for tier, (path, sheet) in sorted(sheets.items(), key=lambda item: tier_sort_key(item[0]))]
+
+def parse_rune_workbooks(sheets):
+    """Parse rune order sheets into the tiered dataset, on a process pool when there are several large ones"""
+    workers = min(len(sheets), os.cpu_count() or 1)
+    paths = [path for _, path, _ in sheets]
+    names = [sheet for _, _, sheet in sheets]
+    if workers <= 1 or sum(os.path.getsize(path) for path in set(paths)) < RUNES_POOL_MIN_BYTES:
+        results = list(map(parse_rune_sheet, paths, names))
+    else:
+        # Not fork: the bot parses from a worker thread, and forking a threaded process can deadlock.
+        # parse_rune_sheet comes from rune_parser, which the workers import without starting a bot
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as pool:
+            results = list(pool.map(parse_rune_sheet, paths, names))
+    
+    return {
+        tier: {"workbook": os.path.basename(path), "sheet": sheet, **result}
+        for (tier, path, sheet), result in zip(sheets, results)
+    }
+
+def sample_dataset():
+    """Tiered dataset holding the sample runes, for when the spreadsheet can't be parsed"""
+    runes = {name: dict(info) for name, info in SAMPLE_RUNES.items()}
+    return {DEFAULT_TIER: {"workbook": None, "sheet": None, "runes": runes, "recommended": list(runes)}}
+
+# Function to parse the Excel file and extract rune data
+def load_runes_from_excel():
+    try:
+        # Check if file exists
+        if not os.path.exists(RUNES_FILE):
+            print(f"ERROR: {RUNES_FILE} file not found!")
+            return {}
+        
+        print(f"Loading runes from {RUNES_FILE}...")
+        runes = parse_runes_from_excel(RUNES_FILE)
+        print(f"Loaded {len(runes)} runes from spreadsheet")
+        return runes
+    
+    except Exception as e:
+        print(f"Error loading runes from Excel: {e}")
+        # Return sample data if Excel parsing fails
+        return {name: dict(info) for name, info in SAMPLE_RUNES.items()}
+
+def file_sha256(path):
+    """Hash a file's contents so snapshots can be matched to their source"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_snapshot_file(path=RUNES_SNAPSHOT_FILE):
+    """The snapshot file's contents if it exists and was written by this parser, else None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable rune snapshot: {e}")
+        return None
+    
+    if snapshot.get('format') != SNAPSHOT_FORMAT or snapshot.get('parser_version') != PARSER_VERSION:
+        return None
+    return snapshot
+
+def read_rune_snapshot(source_hash, path=RUNES_SNAPSHOT_FILE):
+    """Return the snapshot file's contents, or None if it is missing or stale"""
+    snapshot = read_snapshot_file(path)
+    if snapshot is None or snapshot.get('source_sha256') != source_hash:
+        return None
+    return snapshot
+
+def snapshot_created(snapshot):
+    """When a snapshot was compiled, as a Unix timestamp, or None if it doesn't say"""
+    try:
+        return datetime.fromisoformat(snapshot['created']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def write_rune_snapshot(tiers, source_hash, path=RUNES_SNAPSHOT_FILE, created=None):
+    """Atomically write the parsed tiers to the snapshot file"""
+    created = created if created is not None else time.time()
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "parser_version": PARSER_VERSION,
+        "source_sha256": source_hash,
+        "created": datetime.fromtimestamp(created, timezone.utc).isoformat(),
+        "tiers": tiers
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def workbooks_sha256(paths):
+    """One hash over the names and contents of all the workbooks"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{os.path.basename(path)}:{file_sha256(path)}\n".encode())
+    return digest.hexdigest()
+
+def count_runes(tiers):
+    return sum(len(tier["runes"]) for tier in tiers.values())
+
+# Why the last load_runes() fell back to sample or empty data, None if it didn't
+rune_load_error = None
+
+def load_runes():
+    """Load the tiers from the compiled snapshot, re-parsing the workbooks only if they changed
+    
+    Returns tier -> {workbook, sheet, runes, recommended}, the hash of the workbooks
+    they came from (None for fallback data, with the reason in rune_load_error) and
+    when the data was compiled (None if unknown)."""
+    global rune_load_error
+    start = time.perf_counter()
+    rune_load_error = None
+    if RUNES_SNAPSHOT_ONLY:
+        # Shard workers use the snapshot the supervisor compiled, without hashing or parsing
+        snapshot = read_snapshot_file()
+        if snapshot is not None:
+            print(f"Loaded {count_runes(snapshot['tiers'])} runes from shared snapshot in {(time.perf_counter() - start) * 1000:.1f}ms")
+            return snapshot['tiers'], snapshot['source_sha256'], snapshot_created(snapshot)
+        print("Shared rune snapshot missing, falling back to the spreadsheet")
+    
+    sheets = find_rune_sheets()
+    if not sheets:
+        rune_load_error = f"No rune order sheets found in {RUNES_WORKBOOKS}"
+        print(f"ERROR: {rune_load_error}!")
+        return {}, None, None
+    source_hash = workbooks_sha256(sorted({path for _, path, _ in sheets}))
+    
+    snapshot = read_rune_snapshot(source_hash)
+    if snapshot is not None:
+        tiers = snapshot['tiers']
+        print(f"Loaded {count_runes(tiers)} runes in {len(tiers)} tiers from snapshot in {(time.perf_counter() - start) * 1000:.1f}ms")
+        return tiers, source_hash, snapshot_created(snapshot)
+    
+    print(f"Rune snapshot missing or stale, parsing {len(sheets)} rune order sheets...")
+    try:
+        tiers = parse_rune_workbooks(sheets)
+    except Exception as e:
+        rune_load_error = f"Could not parse the rune workbooks: {e}"
+        print(f"Error loading runes from Excel: {e}")
+        return sample_dataset(), None, None
+    
+    created = time.time()
+    try:
+        write_rune_snapshot(tiers, source_hash, created=created)
+    except OSError as e:
+        print(f"Could not write rune snapshot: {e}")
+    print(f"Loaded {count_runes(tiers)} runes in {len(tiers)} tiers from spreadsheets in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return tiers, source_hash, created
+
+def build_snapshot_command():
+    """CLI: re-parse the workbooks and rebuild the rune snapshot ahead of time"""
+    start = time.perf_counter()
+    sheets = find_rune_sheets()
+    source_hash = workbooks_sha256(sorted({path for _, path, _ in sheets}))
+    tiers = parse_rune_workbooks(sheets)
+    write_rune_snapshot(tiers, source_hash)
+    for tier, data in tiers.items():
+        print(f"  {tier}: {len(data['runes'])} runes, {len(data['recommended'])} recommended ({data['workbook']} / {data['sheet']})")
+    print(f"Wrote {count_runes(tiers)} runes in {len(tiers)} tiers to {RUNES_SNAPSHOT_FILE} in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+# Rarity suffixes: powers of ten for K through No, the named decades from De up,
+# and the multipliers that prefix a decade (QdDe = 1e12 * 1e33, TSg = 1e9 * 1e213)
+RARITY_SUFFIXES = {"": 0, "K": 3, "M": 6, "B": 9, "T": 12, "Qd": 15, "Qn": 18, "Sx": 21, "Sp": 24, "Oc": 27, "No": 30}
+RARITY_DECADES = {"De": 33, "Vt": 63, "Tg": 93, "qg": 123, "Qg": 153, "sg": 183, "Sg": 213, "Og": 243, "Ng": 273, "Ce": 303}
+RARITY_MULTIPLIERS = {"U": 3, "D": 6, "T": 9, "Qd": 12, "Qn": 15, "Sx": 18, "Sp": 21, "Oc": 24, "No": 27}
+RARITY_PATTERN = re.compile(r'1/(\d+(?:\.\d+)?)([A-Za-z]*)')
+
+def rarity_exponent(suffix):
+    """Power of ten a rarity suffix stands for, or None if it isn't one"""
+    if suffix in RARITY_SUFFIXES:
+        return RARITY_SUFFIXES[suffix]
+    if suffix in RARITY_DECADES:
+        return RARITY_DECADES[suffix]
+    for decade, exponent in RARITY_DECADES.items():
+        if suffix.endswith(decade) and suffix[:-len(decade)] in RARITY_MULTIPLIERS:
+            return RARITY_MULTIPLIERS[suffix[:-len(decade)]] + exponent
+    return None
+
+def parse_rarity(text):
+    """Odds denominator of a rarity like '1/7.5B' (7.5e9), or None if it can't be read"""
+    match = RARITY_PATTERN.fullmatch(text.strip())
+    if not match:
+        return None
+    exponent = rarity_exponent(match.group(2))
+    if exponent is None:
+        return None
+    try:
+        return float(match.group(1)) * 10.0 ** exponent
+    except OverflowError:
+        return math.inf
+
+# Amount of a stat entry: an optional operator (x, +, -, ^) and a number with a suffix
+STAT_AMOUNT_PATTERN = re.compile(r'([+\-]?[x^]?)(\d+(?:\.\d+)?)([A-Za-z]*)')
+STAT_CAP_PATTERN = re.compile(r'\(\s*MAX\s*([^)]*)\)', re.IGNORECASE)
+STAT_TAG_PATTERN = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+# Abbreviations and misspellings used in the sheet, casefolded
+STAT_ALIASES = {"rs": "Rune Speed", "rune bullk": "Rune Bulk"}
+
+class StatEntry:
+    """One stat a rune gives, like 'x1 Rune Bulk (MAX x5)'"""
+    
+    __slots__ = ('name', 'amount', 'cap', 'value')
+    
+    def __init__(self, name, amount, cap, value):
+        self.name = name
+        self.amount = amount
+        self.cap = cap
+        # Numeric size of the amount, for ranking; None if there is none
+        self.value = value
+    
+    def __repr__(self):
+        return f"StatEntry({self.name!r}, {self.amount!r}, {self.cap!r})"
+
+def split_stat_entries(text):
+    """Split a stats string on the '+' between entries, keeping signs and '+' inside brackets"""
+    entries = []
+    current = []
+    depth = 0
+    for i, char in enumerate(text):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth = max(0, depth - 1)
+        elif char == '+' and depth == 0 and (i == 0 or text[i - 1] in ' )'):
+            entry = "".join(current).strip()
+            if entry:
+                entries.append(entry)
+            # '+50 Chrome' starts an entry with a sign, ' + ' only separates
+            current = [] if i + 1 == len(text) or text[i + 1] == ' ' else ['+']
+            continue
+        current.append(char)
+    entry = "".join(current).strip()
+    if entry:
+        entries.append(entry)
+    return entries
+
+def stat_amount_value(number, suffix):
+    """Numeric value of an amount like 1.5K, or None if the suffix isn't a known one"""
+    exponent = rarity_exponent(suffix)
+    if exponent is None and len(suffix) == 1:
+        exponent = rarity_exponent(suffix.upper())
+    if exponent is None and suffix.endswith('s'):
+        # Durations, like -0.1s
+        exponent = rarity_exponent(suffix[:-1])
+    if exponent is None:
+        return None
+    try:
+        return float(number) * 10.0 ** exponent
+    except OverflowError:
+        return math.inf
+
+def parse_stats(text):
+    """Structured entries of a stats string, skipping text that isn't a stat"""
+    entries = []
+    for part in split_stat_entries(text):
+        if part.startswith('(1/'):
+            # A '(rarity) Rune' cell picked up instead of a stats cell
+            continue
+        cap_match = STAT_CAP_PATTERN.search(part)
+        cap = " ".join(cap_match.group(1).split()) if cap_match else None
+        
+        amount = None
+        value = None
+        head, _, rest = part.partition(' ')
+        amount_match = STAT_AMOUNT_PATTERN.fullmatch(head)
+        if amount_match and rest:
+            amount = head
+            value = stat_amount_value(amount_match.group(2), amount_match.group(3))
+            part = rest
+        
+        name = " ".join(STAT_TAG_PATTERN.sub(' ', part).replace('|', ' ').split())
+        # A stat name is words, not leftovers like '(1/250Nosg) Apex >'
+        if not name or not re.fullmatch(r"[A-Za-z][A-Za-z0-9' ]*", name):
+            continue
+        name = STAT_ALIASES.get(name.casefold(), name)
+        entries.append(StatEntry(name, amount, cap, value))
+    return entries
+
+class Rune:
+    """One rune, with its rarity parsed into a sortable number and its stats into entries"""
+    
+    __slots__ = ('name', 'rarity', 'category', 'stats', 'odds', 'stat_entries')
+    
+    def __init__(self, name, rarity, category, stats):
+        self.name = name
+        self.rarity = rarity
+        self.category = category
+        self.stats = stats
+        self.odds = parse_rarity(rarity)
+        self.stat_entries = parse_stats(stats) if stats != MISSING_STATS else []
+    
+    @classmethod
+    def from_info(cls, name, info):
+        return cls(name, info.get("rarity", ""), info.get("category", ""), info.get("stats", ""))
+    
+    def __eq__(self, other):
+        if not isinstance(other, Rune):
+            return NotImplemented
+        return (self.name, self.rarity, self.category, self.stats) == (other.name, other.rarity, other.category, other.stats)
+    
+    def __repr__(self):
+        return f"Rune({self.name!r}, {self.rarity!r}, {self.category!r})"
+
+# Longest n-gram kept in the substring postings; longer queries intersect their trigrams
+NGRAM_SIZE = 3
+
+def ngrams(text, max_size=NGRAM_SIZE):
+    """All substrings of text up to max_size characters long"""
+    return {text[i:i + size] for size in range(1, max_size + 1) for i in range(len(text) - size + 1)}
+
+def fuzzy_grams(text):
+    """Padded trigrams used for typo-tolerant matching"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it is known to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+# How many of the best trigram candidates get an exact edit distance check
+FUZZY_CANDIDATES = 8
+
+class RuneIndex:
+    """Lookup structures over the rune data, built once whenever the data loads"""
+    
+    def __init__(self, runes):
+        self.names = list(runes)
+        self.positions = {name: position for position, name in enumerate(self.names)}
+        self.exact = {}
+        self.categories = {}
+        name_texts = []
+        search_texts = []
+        
+        for position, (name, rune) in enumerate(runes.items()):
+            folded = name.casefold()
+            self.exact.setdefault(folded, name)
+            self.categories.setdefault(rune.category.casefold(), []).append(name)
+            name_texts.append(folded)
+            search_texts.append((folded, rune.rarity.casefold(), rune.category.casefold()))
+        
+        # Casefolded names in sorted order, for prefix lookups by binary search
+        self.sorted_names = sorted((folded, position) for position, folded in enumerate(name_texts))
+        self.sorted_keys = [folded for folded, _ in self.sorted_names]
+        
+        # Casefolded categories in sorted order, with the spelling used in the sheet
+        self.category_labels = {}
+        for rune in runes.values():
+            self.category_labels.setdefault(rune.category.casefold(), rune.category)
+        self.sorted_categories = sorted(key for key in self.category_labels if key)
+        
+        # Runes with a readable rarity, most common first, for sorting and range queries
+        by_odds = sorted((rune.odds, position) for position, rune in enumerate(runes.values()) if rune.odds is not None)
+        self.rarity_keys = [odds for odds, _ in by_odds]
+        self.rarity_positions = [position for _, position in by_odds]
+        
+        # Stat name -> (position, entry) of every rune giving it: largest amount
+        # first, then the most common rune first
+        self.stat_labels = {}
+        self.stat_postings = {}
+        odds = []
+        for position, rune in enumerate(runes.values()):
+            odds.append(math.inf if rune.odds is None else rune.odds)
+            for entry in rune.stat_entries:
+                key = entry.name.casefold()
+                self.stat_labels.setdefault(key, entry.name)
+                self.stat_postings.setdefault(key, []).append((position, entry))
+        for postings in self.stat_postings.values():
+            postings.sort(key=lambda item: (item[1].value is None, -(item[1].value or 0), odds[item[0]]))
+        self.sorted_stats = sorted(self.stat_labels)
+        
+        # n-gram postings: n-gram -> positions of the runes containing it
+        self.name_texts = name_texts
+        self.search_texts = search_texts
+        self.name_postings = self._build_postings(name_texts)
+        self.search_postings = self._build_postings([" ".join(fields) for fields in search_texts])
+        
+        # Padded trigram postings for typo-tolerant matching
+        self.fuzzy_postings = {}
+        for position, folded in enumerate(name_texts):
+            for gram in fuzzy_grams(folded):
+                self.fuzzy_postings.setdefault(gram, []).append(position)
+    
+    @staticmethod
+    def _build_postings(texts):
+        postings = {}
+        for position, text in enumerate(texts):
+            for gram in ngrams(text):
+                postings.setdefault(gram, []).append(position)
+        return postings
+    
+    @staticmethod
+    def _candidates(postings, query):
+        """Positions whose text may contain query, narrowed via the n-gram postings"""
+        if len(query) <= NGRAM_SIZE:
+            return postings.get(query, [])
+        grams = sorted((postings.get(query[i:i + NGRAM_SIZE], []) for i in range(len(query) - NGRAM_SIZE + 1)), key=len)
+        candidates = set(grams[0])
+        for posting in grams[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return sorted(candidates)
+    
+    def prefix_positions(self, query):
+        """Positions of runes whose name starts with query, in spreadsheet order"""
+        query = query.casefold()
+        start = bisect.bisect_left(self.sorted_keys, query)
+        positions = []
+        for folded, position in self.sorted_names[start:]:
+            if not folded.startswith(query):
+                break
+            positions.append(position)
+        return sorted(positions)
+    
+    def substring_positions(self, query):
+        """Positions of runes whose name contains query, in spreadsheet order"""
+        query = query.casefold()
+        return [p for p in self._candidates(self.name_postings, query) if query in self.name_texts[p]]
+    
+    def find(self, query):
+        """Best matching rune name: exact, then prefix, then substring match"""
+        folded = query.casefold()
+        if folded in self.exact:
+            return self.exact[folded]
+        for positions in (self.prefix_positions(folded), self.substring_positions(folded)):
+            if positions:
+                return self.names[positions[0]]
+        return None
+    
+    def suggest(self, query, limit=3):
+        """Closest rune names to a possibly misspelled query, as (name, distance) pairs"""
+        query = query.casefold()
+        max_distance = min(3, max(1, len(query) // 3))
+        
+        postings = self.fuzzy_postings
+        shared = Counter(itertools.chain.from_iterable(postings.get(gram, ()) for gram in fuzzy_grams(query)))
+        candidates = [position for position, _ in shared.most_common(FUZZY_CANDIDATES)]
+        
+        matches = []
+        for position in candidates:
+            distance = edit_distance(query, self.name_texts[position], max_distance)
+            if distance <= max_distance:
+                matches.append((distance, -shared[position], position))
+        matches.sort()
+        return [(self.names[position], distance) for distance, _, position in matches[:limit]]
+    
+    def search(self, query):
+        """Rune names matching query by name, rarity or category, best matches first"""
+        query = query.casefold()
+        ranked = []
+        seen = set()
+        
+        exact = self.exact.get(query)
+        if exact is not None:
+            ranked.append(self.positions[exact])
+        ranked.extend(self.prefix_positions(query))
+        ranked.extend(self.substring_positions(query))
+        # Anything else only matched on rarity or category
+        ranked.extend(p for p in self._candidates(self.search_postings, query)
+                      if any(query in field for field in self.search_texts[p]))
+        
+        results = []
+        for position in ranked:
+            if position not in seen:
+                seen.add(position)
+                results.append(self.names[position])
+        return results
+    
+    def category(self, category):
+        """Rune names in a category, in spreadsheet order"""
+        return self.categories.get(category.casefold(), [])
+    
+    def find_stat(self, query):
+        """Stat name matching query: exact, then prefix, then substring match"""
+        folded = " ".join(query.split()).casefold()
+        folded = STAT_ALIASES.get(folded, folded).casefold()
+        if folded in self.stat_postings:
+            return self.stat_labels[folded]
+        start = bisect.bisect_left(self.sorted_stats, folded)
+        if start < len(self.sorted_stats) and self.sorted_stats[start].startswith(folded):
+            return self.stat_labels[self.sorted_stats[start]]
+        for key in self.sorted_stats:
+            if folded in key:
+                return self.stat_labels[key]
+        return None
+    
+    def stat(self, stat_name):
+        """(rune name, entry) for every rune giving a stat, largest amount first"""
+        return [(self.names[position], entry) for position, entry in self.stat_postings.get(stat_name.casefold(), [])]
+    
+    def by_rarity(self, rarest_first=False):
+        """Rune names with a readable rarity, most common first"""
+        positions = reversed(self.rarity_positions) if rarest_first else self.rarity_positions
+        return [self.names[position] for position in positions]
+    
+    def rarity_range(self, low, high):
+        """Rune names whose odds denominator is between low and high, most common first"""
+        start = bisect.bisect_left(self.rarity_keys, low)
+        end = bisect.bisect_right(self.rarity_keys, high)
+        return [self.names[position] for position in self.rarity_positions[start:end]]
+    
+    def complete_names(self, current, limit=25):
+        """Rune names for autocomplete: names starting with current in sorted order, then ones containing it"""
+        current = current.casefold()
+        start = bisect.bisect_left(self.sorted_keys, current)
+        names = []
+        for folded, position in self.sorted_names[start:]:
+            if len(names) >= limit or not folded.startswith(current):
+                break
+            if folded:
+                names.append(self.names[position])
+        
+        if len(names) < limit and len(current) >= NGRAM_SIZE:
+            for position in self.substring_positions(current):
+                name = self.names[position]
+                if not self.name_texts[position].startswith(current):
+                    names.append(name)
+                    if len(names) >= limit:
+                        break
+        return names
+    
+    def complete_stats(self, current, limit=25):
+        """Stat names for autocomplete, in sorted order"""
+        current = current.casefold()
+        start = bisect.bisect_left(self.sorted_stats, current)
+        labels = []
+        for key in itertools.islice(self.sorted_stats, start, None):
+            if len(labels) >= limit or not key.startswith(current):
+                break
+            labels.append(self.stat_labels[key])
+        return labels
+    
+    def complete_categories(self, current, limit=25):
+        """Category names for autocomplete, in sorted order"""
+        current = current.casefold()
+        start = bisect.bisect_left(self.sorted_categories, current)
+        labels = []
+        for key in itertools.islice(self.sorted_categories, start, None):
+            if len(labels) >= limit or not key.startswith(current):
+                break
+            labels.append(self.category_labels[key])
+        
+        if len(labels) < limit:
+            labels.extend(itertools.islice((self.category_labels[key] for key in self.sorted_categories
+                                            if current in key and not key.startswith(current)), limit - len(labels)))
+        return labels
+
+class RuneTier:
+    """The runes of one tier's sheet with their index and the sheet's recommended order"""
+    
+    def __init__(self, name, runes, recommended, workbook=None, sheet=None):
+        records = {rune_name: Rune.from_info(rune_name, info) for rune_name, info in runes.items()}
+        self.name = name
+        self.runes = MappingProxyType(records)
+        self.index = RuneIndex(records)
+        self.recommended = [rune_name for rune_name in recommended if rune_name in records]
+        self.workbook = workbook
+        self.sheet = sheet
+
+class RuneSnapshot:
+    """One immutable load of the rune data of every tier together with its indexes
+    
+    Commands grab the current snapshot once and use it throughout, so a reload
+    swapping in a new one never exposes a half-built dict."""
+    
+    def __init__(self, tiers, source_hash, version, load_seconds, compiled_at=None):
+        self.tiers = {
+            name: RuneTier(name, data["runes"], data.get("recommended", []), data.get("workbook"), data.get("sheet"))
+            for name, data in sorted(tiers.items(), key=lambda item: tier_sort_key(item[0]))
+        }
+        self.tier_keys = {name.casefold(): tier for name, tier in self.tiers.items()}
+        self.default_tier = self.tiers.get(DEFAULT_TIER) or next(iter(self.tiers.values()), None) or RuneTier(DEFAULT_TIER, {}, [])
+        # The default tier, for everything that doesn't pick one
+        self.runes = self.default_tier.runes
+        self.index = self.default_tier.index
+        self.rune_count = sum(len(tier.runes) for tier in self.tiers.values())
+        self.source_hash = source_hash
+        self.version = version
+        self.load_seconds = load_seconds
+        self.loaded_at = datetime.now()
+        # When the data was compiled, for Last-Modified: the same across restarts
+        # and reloads while the snapshot file is reused
+        self.compiled_at = compiled_at if compiled_at is not None else time.time()
+    
+    def tier(self, name=None):
+        """A tier by name (T13, t13 or 13), the default tier for None, or None if there is no such tier"""
+        if not name:
+            return self.default_tier
+        key = name.casefold()
+        return self.tier_keys.get(key) or self.tier_keys.get(f"t{key}")
+
+# The rune data currently served; replaced as a whole by reload_runes()
+rune_snapshot = None
+# Last seen change marker of the workbooks, to skip hashing when nothing changed
+rune_file_stamp = None
+rune_reload_lock = threading.Lock()
+
+# How often the background watcher checks the workbooks for changes, in seconds
+RUNES_RELOAD_INTERVAL = int(os.environ.get('RUNES_RELOAD_INTERVAL', 60))
+
+def file_stamp(path):
+    """Cheap change marker for a file: (mtime, size), or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def workbooks_stamp():
+    """Change marker for the set of workbooks and each of their contents"""
+    return tuple((path, file_stamp(path)) for path in workbook_paths())
+
+def runes_watch_stamp():
+    """Change marker for the rune data source: shard workers follow the supervisor's snapshot"""
+    if RUNES_SNAPSHOT_ONLY:
+        return file_stamp(RUNES_SNAPSHOT_FILE)
+    return workbooks_stamp()
+
+def reload_runes(force=False):
+    """Re-load the rune data if the spreadsheet changed and swap in a new snapshot
+    
+    Blocking; call it from a worker thread when on the event loop. Returns a report
+    with the load time and how many runes were added, removed or changed."""
+    global rune_snapshot, rune_file_stamp
+    
+    with rune_reload_lock:
+        old = rune_snapshot
+        stamp = runes_watch_stamp()
+        if not force and old is not None and stamp == rune_file_stamp:
+            return {"reloaded": False, "version": old.version, "runes": old.rune_count}
+        
+        start = time.perf_counter()
+        tiers, source_hash, compiled_at = load_runes()
+        load_seconds = time.perf_counter() - start
+        
+        if old is not None and source_hash is None:
+            # A missing or half-written workbook: keep serving the current data, and keep
+            # the old stamp so the next check tries again
+            return {"reloaded": False, "error": rune_load_error, "version": old.version, "runes": old.rune_count,
+                    "load_ms": round(load_seconds * 1000, 1)}
+        rune_file_stamp = stamp
+        
+        if old is not None and source_hash is not None and source_hash == old.source_hash:
+            return {"reloaded": False, "version": old.version, "runes": old.rune_count,
+                    "load_ms": round(load_seconds * 1000, 1)}
+        
+        snapshot = RuneSnapshot(tiers, source_hash, old.version + 1 if old else 1, load_seconds, compiled_at)
+        # Compare per (tier, rune name)
+        old_runes = {(tier.name, name): rune for tier in old.tiers.values() for name, rune in tier.runes.items()} if old else {}
+        new_runes = {(tier.name, name): rune for tier in snapshot.tiers.values() for name, rune in tier.runes.items()}
+        report = {
+            "reloaded": True,
+            "version": snapshot.version,
+            "runes": snapshot.rune_count,
+            "tiers": len(snapshot.tiers),
+            "load_ms": round(load_seconds * 1000, 1),
+            "added": sum(1 for key in new_runes if key not in old_runes),
+            "removed": sum(1 for key in old_runes if key not in new_runes),
+            "changed": sum(1 for key, rune in new_runes.items() if key in old_runes and old_runes[key] != rune),
+        }
+        rune_snapshot = snapshot
+        metrics.inc("bot_rune_reloads_total")
+        return report
+
+@tasks.loop(seconds=RUNES_RELOAD_INTERVAL)
+async def watch_runes_file():
+    """Reload the rune data in the background whenever a workbook changes"""
+    if runes_watch_stamp() == rune_file_stamp:
+        return
+    report = await asyncio.to_thread(reload_runes)
+    if report["reloaded"]:
+        print(f"Reloaded runes v{report['version']} in {report['load_ms']}ms: "
+              f"+{report['added']} -{report['removed']} ~{report['changed']}")
+    elif report.get("error"):
+        print(f"Rune reload failed, still serving v{report['version']}: {report['error']}")
+
+def local_shard_status():
+    """Per-shard state of the shards this process runs"""
+    if not isinstance(bot, commands.AutoShardedBot):
+        return []
+    guild_counts = Counter(guild.shard_id for guild in bot.guilds)
+    shards = []
+    for shard_id, shard in sorted(bot.shards.items()):
+        latency = shard.latency
+        shards.append({
+            "shard_id": shard_id,
+            "worker": SHARD_WORKER,
+            "latency_ms": round(latency * 1000, 1) if math.isfinite(latency) else None,
+            "closed": shard.is_closed(),
+            "guilds": guild_counts.get(shard_id, 0),
+        })
+    return shards
+
+def shard_status():
+    """Per-shard state of this process plus any other shard workers' published state"""
+    shards = local_shard_status()
+    if SHARD_STATUS_DIR:
+        for path in glob.glob(os.path.join(SHARD_STATUS_DIR, 'shard-worker-*.json')):
+            try:
+                with open(path, 'r') as f:
+                    published = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if published.get('worker') != SHARD_WORKER:
+                shards.extend(published.get('shards', []))
+    return sorted(shards, key=lambda shard: shard['shard_id'])
+
+@tasks.loop(seconds=15)
+async def publish_shard_status():
+    """Share this worker's shard state with the worker serving /status"""
+    path = os.path.join(SHARD_STATUS_DIR, f'shard-worker-{SHARD_WORKER}.json')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"worker": SHARD_WORKER, "pid": os.getpid(), "updated": datetime.now().isoformat(),
+                   "shards": local_shard_status()}, f)
+    os.replace(tmp_path, path)
+
+def shard_ranges(shard_count, workers):
+    """Split shard ids 0..shard_count-1 into contiguous ranges, one per worker"""
+    per_worker, extra = divmod(shard_count, workers)
+    ranges = []
+    start = 0
+    for worker in range(workers):
+        size = per_worker + (1 if worker < extra else 0)
+        if size:
+            ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+def run_shard_supervisor():
+    """Run one bot process per shard range, all sharing one compiled rune snapshot"""
+    # Compile the snapshot once up front so no worker ever parses the spreadsheet
+    load_runes()
+    runes_stamp = workbooks_stamp()
+    next_runes_check = time.monotonic() + RUNES_RELOAD_INTERVAL
+    
+    shard_count = SHARD_COUNT or SHARD_WORKERS
+    status_dir = SHARD_STATUS_DIR or tempfile.mkdtemp(prefix='ascenders-shards-')
+    
+    def spawn(worker, shard_ids):
+        env = dict(os.environ, SHARD_MODE='process', SHARD_COUNT=str(shard_count),
+                   SHARD_IDS=",".join(map(str, shard_ids)), SHARD_WORKER=str(worker),
+                   SHARD_STATUS_DIR=status_dir, RUNES_SNAPSHOT_ONLY='1')
+        if worker:
+            # Only the first worker binds the web server port
+            env['HTTP_SERVER'] = 'none'
+        process = subprocess.Popen([sys.executable, os.path.abspath(__file__)], env=env)
+        print(f"Started shard worker {worker} (pid {process.pid}) for shards {shard_ids} of {shard_count}")
+        return process
+    
+    workers = {worker: (shard_ids, spawn(worker, shard_ids))
+               for worker, shard_ids in enumerate(shard_ranges(shard_count, SHARD_WORKERS))}
+    
+    # Render stops services with SIGTERM; turn it into SystemExit so workers get stopped too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        while True:
+            time.sleep(5)
+            for worker, (shard_ids, process) in workers.items():
+                if process.poll() is not None:
+                    print(f"Shard worker {worker} exited with code {process.returncode}, restarting")
+                    workers[worker] = (shard_ids, spawn(worker, shard_ids))
+            
+            # Rebuild the shared snapshot when the spreadsheet changes; workers pick it up
+            if time.monotonic() >= next_runes_check:
+                next_runes_check = time.monotonic() + RUNES_RELOAD_INTERVAL
+                stamp = workbooks_stamp()
+                if stamp != runes_stamp:
+                    runes_stamp = stamp
+                    load_runes()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for _, process in workers.values():
+            process.terminate()
+        for _, process in workers.values():
+            process.wait()
+
+# The startup load task, referenced so it isn't garbage collected while it runs
+rune_load_task = None
+# Seconds between attempts when the startup load fails
+RUNES_LOAD_RETRY = float(os.environ.get('RUNES_LOAD_RETRY', 30))
+
+async def load_initial_runes():
+    """Load the rune data in a worker thread, then start watching for changes
+    
+    If loading raises, the sample data is served and the load retried."""
+    global rune_snapshot, rune_load_error
+    while True:
+        try:
+            report = await asyncio.to_thread(reload_runes, True)
+            break
+        except Exception as e:
+            rune_load_error = f"Loading rune data failed: {e!r}"
+            print(f"ERROR: {rune_load_error}, retrying in {RUNES_LOAD_RETRY:g}s")
+            traceback.print_exc()
+            with rune_reload_lock:
+                if rune_snapshot is None:
+                    rune_snapshot = RuneSnapshot(sample_dataset(), None, 1, 0.0)
+            await asyncio.sleep(RUNES_LOAD_RETRY)
+    
+    startup_timings["runes_ready_after_s"] = round(time.monotonic() - BOOT_TIME, 3)
+    print(f"Rune data ready: {report['runes']} runes in {report.get('load_ms', 0)}ms "
+          f"({startup_timings['runes_ready_after_s']}s after start)")
+    
+    if not watch_runes_file.is_running():
+        watch_runes_file.start()
+
+class ResponseCache:
+    """Bounded LRU cache of prebuilt command responses"""
+    
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # The bot's event loop and the API server's threads share the cache
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        with self.lock:
+            response = self.entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return response
+    
+    def put(self, key, response):
+        with self.lock:
+            self.entries[key] = response
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+    
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "max_size": self.max_size}
+
+# Responses are keyed by (command, normalized argument, rune data version)
+response_cache = ResponseCache(int(os.environ.get('RESPONSE_CACHE_SIZE', 512)))
+
+# Paginated results: lines per page, how long a rendered page is kept, how long
+# buttons keep responding, and how many paginated messages respond at once
+RESULTS_PAGE_SIZE = int(os.environ.get('RESULTS_PAGE_SIZE', 20))
+RESULTS_PAGE_TTL = float(os.environ.get('RESULTS_PAGE_TTL', 300))
+RESULTS_VIEW_TIMEOUT = float(os.environ.get('RESULTS_VIEW_TIMEOUT', 180))
+MAX_LIVE_VIEWS = int(os.environ.get('MAX_LIVE_VIEWS', 200))
+
+class ResultPages:
+    """Ordered results of one query, rendered into embeds one page at a time"""
+    
+    def __init__(self, title, names, format_line, color, page_size=RESULTS_PAGE_SIZE):
+        self.title = title
+        self.names = names
+        self.format_line = format_line
+        self.color = color
+        self.page_size = page_size
+        self.page_count = max(1, math.ceil(len(names) / page_size))
+        # page number -> (embed, expiry time)
+        self.rendered = {}
+    
+    def page(self, number):
+        cached = self.rendered.get(number)
+        now = time.monotonic()
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        
+        start = number * self.page_size
+        embed = discord.Embed(
+            title=self.title,
+            description="\n".join(self.format_line(name) for name in self.names[start:start + self.page_size]),
+            color=self.color
+        )
+        if self.page_count > 1:
+            embed.set_footer(text=f"Page {number + 1}/{self.page_count} ({len(self.names)} runes)")
+        self.rendered[number] = (embed, now + RESULTS_PAGE_TTL)
+        return embed
+
+class ResultsView(discord.ui.View):
+    """Buttons for paging through a ResultPages"""
+    
+    def __init__(self, pages):
+        super().__init__(timeout=RESULTS_VIEW_TIMEOUT)
+        self.pages = pages
+        self.number = 0
+        self.message = None
+        self.update_buttons()
+    
+    def update_buttons(self):
+        last = self.pages.page_count - 1
+        self.first.disabled = self.previous.disabled = self.number == 0
+        self.next.disabled = self.last.disabled = self.number == last
+    
+    async def show(self, interaction, number):
+        self.number = max(0, min(number, self.pages.page_count - 1))
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.pages.page(self.number), view=self)
+    
+    @discord.ui.button(label="⏮", style=discord.ButtonStyle.secondary)
+    async def first(self, interaction, button):
+        await self.show(interaction, 0)
+    
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.primary)
+    async def previous(self, interaction, button):
+        await self.show(interaction, self.number - 1)
+    
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.primary)
+    async def next(self, interaction, button):
+        await self.show(interaction, self.number + 1)
+    
+    @discord.ui.button(label="⏭", style=discord.ButtonStyle.secondary)
+    async def last(self, interaction, button):
+        await self.show(interaction, self.pages.page_count - 1)
+    
+    async def close(self):
+        """Remove the buttons from the message"""
+        if self.message is None:
+            return
+        try:
+            await self.message.edit(view=None)
+        except discord.HTTPException:
+            pass
+    
+    async def on_timeout(self):
+        live_views.discard(self)
+        await self.close()
+
+class LiveViews:
+    """Result views whose buttons still respond, closing the oldest past max_size"""
+    
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.views = OrderedDict()
+        # Tasks removing the buttons of evicted views, referenced until they finish
+        self.closing = set()
+    
+    def add(self, view):
+        self.views[view] = None
+        while len(self.views) > self.max_size:
+            oldest, _ = self.views.popitem(last=False)
+            oldest.stop()
+            task = asyncio.create_task(oldest.close())
+            self.closing.add(task)
+            task.add_done_callback(self.closing.discard)
+    
+    def discard(self, view):
+        self.views.pop(view, None)
+
+live_views = LiveViews(MAX_LIVE_VIEWS)
+
+async def send_response(send, response):
+    """Send a command response, with page buttons when it holds more than one page of results"""
+    pages = response.get("pages")
+    if pages is None:
+        return await send(**response)
+    if pages.page_count == 1:
+        return await send(embed=pages.page(0))
+    
+    view = ResultsView(pages)
+    view.message = await send(embed=pages.page(0), view=view)
+    live_views.add(view)
+    return view.message
+
+async def require_runes(ctx):
+    """Current rune snapshot, or None after telling the user the data is still loading"""
+    snapshot = rune_snapshot
+    if snapshot is None:
+        await ctx.send("Rune data is still loading, please try again in a few seconds.")
+    return snapshot
+
+# Remove default help command to prevent duplicates
+bot.remove_command('help')
+
+@bot.command(name='ping')
+async def ping(ctx):
+    """Check if the bot is responsive"""
+    latency = bot.latency * 1000  # Convert to milliseconds
+    await ctx.send(f'Pong! Latency: {latency:.2f}ms (Instance: {INSTANCE_ID})')
+
+def build_rune_response(tier, rune_name):
+    """Message for !rune, as keyword arguments for ctx.send"""
+    with timed('lookup'):
+        found_name = tier.index.find(rune_name)
+        suggestions = []
+        
+        if found_name is None:
+            # Fall back to the closest spelling
+            suggestions = [name for name, _ in tier.index.suggest(rune_name)]
+    
+    if found_name is None:
+        if not suggestions:
+            return {"content": f"Rune '{rune_name}' not found. Try another name!"}
+        found_name = suggestions.pop(0)
+    
+    rune = tier.runes[found_name]
+    
+    # Create embed response
+    embed = discord.Embed(
+        title=f"{found_name} Rune",
+        color=discord.Color.blue()
+    )
+    
+    embed.add_field(name="Rarity", value=rune.rarity or "N/A", inline=True)
+    embed.add_field(name="Category", value=rune.category or "N/A", inline=True)
+    embed.add_field(name="Stats", value=rune.stats or "N/A", inline=False)
+    
+    if found_name.casefold() != rune_name.casefold() and rune_name.casefold() not in found_name.casefold():
+        embed.description = f"No rune named '{rune_name}', showing the closest match."
+        if suggestions:
+            embed.set_footer(text=f"Did you mean: {', '.join(suggestions)}?")
+    
+    return {"embed": embed}
+
+def rune_line(runes_data, name):
+    """List entry for a rune: name and rarity"""
+    return f"• {name} ({runes_data[name].rarity or 'N/A'})"
+
+def build_runes_list_response(tier, sort=None):
+    """Message for !runes"""
+    runes_data = tier.runes
+    if not runes_data:
+        return {"content": "No runes data available."}
+    
+    if sort == 'rarity':
+        title = "Available Runes (Most Common First)"
+        names = tier.index.by_rarity()
+    else:
+        title = "Available Runes"
+        names = list(runes_data)
+    
+    pages = ResultPages(title, names, lambda name: rune_line(runes_data, name), discord.Color.green())
+    return {"pages": pages}
+
+def build_rarest_response(tier):
+    """Message for !rarest"""
+    names = tier.index.by_rarity(rarest_first=True)
+    if not names:
+        return {"content": "No runes data available."}
+    
+    runes_data = tier.runes
+    pages = ResultPages("Rarest Runes", names, lambda name: rune_line(runes_data, name), discord.Color.dark_red())
+    return {"pages": pages}
+
+def build_category_response(tier, category):
+    """Message for !category"""
+    with timed('lookup'):
+        names = tier.index.category(category)
+    if not names:
+        return {"content": f"No runes found in category '{category}'"}
+    
+    runes_data = tier.runes
+    pages = ResultPages(f"{category} Runes", names, lambda name: rune_line(runes_data, name), discord.Color.purple())
+    return {"pages": pages}
+
+def build_stat_response(tier, stat_name):
+    """Message for !stat"""
+    with timed('lookup'):
+        found = tier.index.find_stat(stat_name)
+        entries = tier.index.stat(found) if found else []
+    
+    if not entries:
+        return {"content": f"No runes found giving '{stat_name}'"}
+    
+    runes_data = tier.runes
+    
+    def format_line(item):
+        name, entry = item
+        amount = f"{entry.amount} " if entry.amount else ""
+        cap = f" (max {entry.cap})" if entry.cap else ""
+        return f"• {name or 'Unnamed'} ({runes_data[name].rarity or 'N/A'}): {amount}{entry.name}{cap}"
+    
+    pages = ResultPages(f"Runes giving {found}", entries, format_line, discord.Color.blurple())
+    return {"pages": pages}
+
+def parse_rarity_range(text):
+    """(low, high) odds for a range like '1B-1T' or '1/1B-1/1T', a single rarity matches just itself"""
+    bounds = []
+    for bound in text.split('-'):
+        bound = bound.strip()
+        odds = parse_rarity(bound if bound.startswith('1/') else '1/' + bound)
+        if odds is None:
+            return None
+        bounds.append(odds)
+    if len(bounds) == 1:
+        return bounds[0], bounds[0]
+    if len(bounds) != 2:
+        return None
+    return min(bounds), max(bounds)
+
+def build_search_response(tier, query):
+    """Message for !search"""
+    if query.casefold().startswith('rarity:'):
+        bounds = parse_rarity_range(query[len('rarity:'):])
+        if bounds is None:
+            return {"content": f"Couldn't read the rarity range in '{query}', try something like `rarity:1B-1T`"}
+        with timed('lookup'):
+            names = tier.index.rarity_range(*bounds)
+    else:
+        with timed('lookup'):
+            names = tier.index.search(query)
+    
+    if not names:
+        return {"content": f"No runes found matching '{query}'"}
+    
+    runes_data = tier.runes
+    
+    def format_line(name):
+        rune = runes_data[name]
+        return f"• {name} ({rune.rarity or 'N/A'}) - {rune.category or 'N/A'}"
+    
+    pages = ResultPages(f"Search Results for '{query}'", names, format_line, discord.Color.orange())
+    return {"pages": pages}
+
+def build_latest_response(tier):
+    """Message for !latest"""
+    runes_data = tier.runes
+    if not runes_data:
+        return {"content": "No runes data available."}
+    
+    # Runes from the sheet's "(Recommended)" order block
+    rune_list = []
+    for rune_name in tier.recommended[:8]:  # Show first 8
+        rarity = runes_data[rune_name].rarity or "N/A"
+        rune_list.append(f"• **{rune_name}** ({rarity})")
+    
+    if not rune_list:
+        return {"content": "Could not load recommended runes."}
+    
+    embed = discord.Embed(
+        title="📈 Latest Recommended Runes",
+        description="Top priority runes to grind:\n" + "\n".join(rune_list),
+        color=discord.Color.teal()
+    )
+    
+    embed.set_footer(text=f"Based on current {tier.name} late game progression")
+    return {"embed": embed}
+
+# A tier: option in a command's arguments, like '!rune Bloom tier:T12'
+TIER_OPTION_PATTERN = re.compile(r'(?:^|\s)tier:(\S*)', re.IGNORECASE)
+
+def split_tier(text):
+    """(tier, remaining text) for command arguments that may contain tier:T12"""
+    match = TIER_OPTION_PATTERN.search(text)
+    if not match:
+        return None, text
+    return match.group(1), " ".join((text[:match.start()] + " " + text[match.end():]).split())
+
+def unknown_tier_message(snapshot, tier_name):
+    return f"No tier '{tier_name}'. Available tiers: {', '.join(snapshot.tiers) or 'none'}"
+
+def query_key(snapshot, tier, command, argument):
+    """Identifies a query: the same command and argument on the same tier of the same rune data"""
+    return command, " ".join(argument.split()).casefold(), tier.name, snapshot.version
+
+def cached_response(snapshot, tier, command, argument, build):
+    """A rune command's response, reusing the prebuilt one for the same query and data"""
+    key = query_key(snapshot, tier, command, argument)
+    response = response_cache.get(key)
+    if response is None:
+        with timed('embed'):
+            response = build(tier)
+        response_cache.put(key, response)
+    return response
+
+async def send_cached(ctx, command, argument, build, tier_name=None):
+    """Send a rune command's cached response, for the default tier or tier_name"""
+    snapshot = await require_runes(ctx)
+    if snapshot is None:
+        return
+    tier = snapshot.tier(tier_name)
+    if tier is None:
+        await ctx.send(unknown_tier_message(snapshot, tier_name))
+        return
+    
+    # The same query in the same channel is answered once; the answer is there for everyone
+    key = (ctx.channel.id,) + query_key(snapshot, tier, command, argument)
+    if not coalescer.claim(key):
+        metrics.inc("bot_coalesced_total", command=command)
+        return
+    try:
+        await send_response(ctx.send, cached_response(snapshot, tier, command, argument, build))
+    finally:
+        coalescer.release(key)
+
+async def send_usage(ctx):
+    """Tell the user how to call the command, for when nothing is left after the options"""
+    await ctx.send(f"Usage: `{ctx.clean_prefix}{ctx.command.name} {ctx.command.usage}`")
+
+@bot.command(name='rune', usage='<rune name> [tier:T12]')
+async def get_rune_info(ctx, *, rune_name: str):
+    """Get information about a specific rune"""
+    tier_name, rune_name = split_tier(rune_name)
+    if not rune_name:
+        await send_usage(ctx)
+        return
+    await send_cached(ctx, 'rune', rune_name, lambda tier: build_rune_response(tier, rune_name), tier_name)
+
+@bot.command(name='runes')
+async def list_runes(ctx, *, options: str = ''):
+    """List all available runes, optionally with sort:rarity"""
+    tier_name, options = split_tier(options)
+    sort = 'rarity' if options.casefold().replace(' ', '') == 'sort:rarity' else None
+    await send_cached(ctx, 'runes', sort or '', lambda tier: build_runes_list_response(tier, sort), tier_name)
+
+@bot.command(name='rarest')
+async def rarest_runes(ctx, *, options: str = ''):
+    """List runes from rarest to most common"""
+    tier_name, _ = split_tier(options)
+    await send_cached(ctx, 'rarest', '', build_rarest_response, tier_name)
+
+@bot.command(name='category', usage='<category> [tier:T12]')
+async def list_category_runes(ctx, *, category: str):
+    """List runes by category"""
+    tier_name, category = split_tier(category)
+    if not category:
+        await send_usage(ctx)
+        return
+    await send_cached(ctx, 'category', category, lambda tier: build_category_response(tier, category), tier_name)
+
+@bot.command(name='search', usage='<query> [tier:T12]')
+async def search_runes(ctx, *, query: str):
+    """Search for runes by name or rarity"""
+    tier_name, query = split_tier(query)
+    if not query:
+        await send_usage(ctx)
+        return
+    await send_cached(ctx, 'search', query, lambda tier: build_search_response(tier, query), tier_name)
+
+@bot.command(name='stat', usage='<stat name> [tier:T12]')
+async def stat_runes(ctx, *, stat_name: str):
+    """List the runes giving a stat, largest amount first"""
+    tier_name, stat_name = split_tier(stat_name)
+    if not stat_name:
+        await send_usage(ctx)
+        return
+    await send_cached(ctx, 'stat', stat_name, lambda tier: build_stat_response(tier, stat_name), tier_name)
+
+@bot.command(name='latest')
+async def latest_runes(ctx, *, options: str = ''):
+    """Show the latest recommended runes from the spreadsheet"""
+    tier_name, _ = split_tier(options)
+    await send_cached(ctx, 'latest', '', build_latest_response, tier_name)
+
+
+# JSON API over the rune data (/api/...), served by both web servers. Bodies are
+# serialized once per rune data version and query, and revalidated with
+# ETag/Last-Modified so unchanged data costs a 304
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 50))
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 200))
+
+def json_number(value):
+    """A float for JSON, None if missing or infinite"""
+    return value if value is not None and math.isfinite(value) else None
+
+# Fields a client can pick with ?fields=, and how each is read from a Rune
+API_FIELDS = {
+    "name": lambda rune: rune.name,
+    "rarity": lambda rune: rune.rarity,
+    "odds": lambda rune: json_number(rune.odds),
+    "category": lambda rune: rune.category,
+    "stats": lambda rune: rune.stats,
+    "stat_entries": lambda rune: [
+        {"name": entry.name, "amount": entry.amount, "cap": entry.cap, "value": json_number(entry.value)}
+        for entry in rune.stat_entries
+    ],
+}
+
+class ApiError(Exception):
+    """A request the API refuses, with the HTTP status and JSON body to answer with"""
+    
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.payload = {"error": message, **details}
+
+def api_fields(text):
+    """Field names from a ?fields= list like 'rarity,category'; the name is always included"""
+    if not text:
+        return tuple(API_FIELDS)
+    fields = ["name"]
+    for field in text.split(','):
+        field = field.strip()
+        if field not in API_FIELDS:
+            raise ApiError(400, f"Unknown field '{field}'", fields=list(API_FIELDS))
+        if field not in fields:
+            fields.append(field)
+    return tuple(fields)
+
+def api_limit(text):
+    """Page size from ?limit=, capped at API_MAX_PAGE_SIZE"""
+    if not text:
+        return API_PAGE_SIZE
+    try:
+        limit = int(text)
+    except ValueError:
+        raise ApiError(400, f"Invalid limit '{text}'")
+    return max(1, min(limit, API_MAX_PAGE_SIZE))
+
+def encode_cursor(offset, name):
+    """Opaque cursor for the page starting at offset, right after the rune called name"""
+    return base64.urlsafe_b64encode(f"{offset}:{name}".encode('utf-8')).decode('ascii').rstrip('=')
+
+def cursor_offset(cursor, names):
+    """Where in names a cursor continues, following its rune if the data changed since"""
+    try:
+        offset, name = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8').split(':', 1)
+        offset = int(offset)
+    except ValueError:
+        raise ApiError(400, "Invalid cursor")
+    if 0 < offset <= len(names) and names[offset - 1] == name:
+        return offset
+    try:
+        return names.index(name) + 1
+    except ValueError:
+        raise ApiError(400, "Invalid cursor, the rune it continues from is gone")
+
+def api_rune_page(tier, names, query):
+    """One page of runes from names, as selected by the query's cursor, limit and fields"""
+    fields = api_fields(query.get('fields'))
+    limit = api_limit(query.get('limit'))
+    cursor = query.get('cursor')
+    start = cursor_offset(cursor, names) if cursor else 0
+    page = names[start:start + limit]
+    end = start + len(page)
+    runes_data = tier.runes
+    return {
+        "tier": tier.name,
+        "total": len(names),
+        "runes": [{field: API_FIELDS[field](runes_data[name]) for field in fields} for name in page],
+        "next_cursor": encode_cursor(end, page[-1]) if page and end < len(names) else None,
+    }
+
+def api_runes(tier, query):
+    """/api/runes: every rune in spreadsheet order, or most common first with ?sort=rarity"""
+    sort = query.get('sort')
+    if sort not in (None, '', 'rarity'):
+        raise ApiError(400, f"Unknown sort '{sort}'", sorts=["rarity"])
+    names = tier.index.by_rarity() if sort == 'rarity' else tier.index.names
+    return api_rune_page(tier, names, query)
+
+def api_rune(tier, query, name):
+    """/api/runes/<name>: one rune by exact name, ignoring case"""
+    found = tier.index.exact.get(name.casefold())
+    if found is None:
+        raise ApiError(404, f"No rune named '{name}'", suggestions=[suggestion for suggestion, _ in tier.index.suggest(name)])
+    rune = tier.runes[found]
+    return {"tier": tier.name, "rune": {field: API_FIELDS[field](rune) for field in api_fields(query.get('fields'))}}
+
+def api_categories(tier, query):
+    """/api/categories: category names in sorted order with how many runes each has"""
+    index = tier.index
+    return {
+        "tier": tier.name,
+        "categories": [{"name": index.category_labels[key], "runes": len(index.categories[key])} for key in index.sorted_categories],
+    }
+
+def api_search(tier, query):
+    """/api/search?q=: runes matching by name, rarity or category, or a rarity range like rarity:1B-1T"""
+    text = (query.get('q') or '').strip()
+    if not text:
+        raise ApiError(400, "Missing search query, pass it as ?q=")
+    if text.casefold().startswith('rarity:'):
+        bounds = parse_rarity_range(text[len('rarity:'):])
+        if bounds is None:
+            raise ApiError(400, f"Couldn't read the rarity range in '{text}', try something like rarity:1B-1T")
+        names = tier.index.rarity_range(*bounds)
+    else:
+        names = tier.index.search(text)
+    return {"query": text, **api_rune_page(tier, names, query)}
+
+API_ENDPOINTS = {
+    'runes': api_runes,
+    'rune': api_rune,
+    'categories': api_categories,
+    'search': api_search,
+}
+
+# The query parameters that shape each response, for the body cache key
+API_PARAMS = ('tier', 'fields', 'limit', 'cursor', 'sort', 'q')
+
+# Serialized bodies keyed by (endpoint, name, query parameters, tier, rune data version)
+api_cache = ResponseCache(int(os.environ.get('API_CACHE_SIZE', 512)))
+
+def api_page(snapshot, endpoint, query, name=None):
+    """The serialized response for an API request, built once per rune data version"""
+    tier = snapshot.tier(query.get('tier'))
+    if tier is None:
+        raise ApiError(404, f"No tier '{query.get('tier')}'", tiers=list(snapshot.tiers))
+    key = (endpoint, name, tuple(query.get(param) for param in API_PARAMS), tier.name, snapshot.version)
+    page = api_cache.get(key)
+    if page is None:
+        build = API_ENDPOINTS[endpoint]
+        payload = build(tier, query, name) if name is not None else build(tier, query)
+        payload["version"] = snapshot.version
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+        page = RenderedPage(body, snapshot.version, content_type='application/json')
+        api_cache.put(key, page)
+    return page
+
+def api_response(endpoint, query, request_headers, name=None):
+    """(status, headers, body) for an API request, from either web server"""
+    snapshot = rune_snapshot
+    try:
+        if snapshot is None:
+            raise ApiError(503, "Rune data is still loading")
+        page = api_page(snapshot, endpoint, query, name)
+    except ApiError as error:
+        metrics.inc("bot_api_requests_total", endpoint=endpoint, status=str(error.status))
+        body = json.dumps(error.payload, ensure_ascii=False).encode('utf-8')
+        return error.status, {'Content-Type': 'application/json', 'Cache-Control': 'no-store'}, body
+    status, headers, body = page_response(page, request_headers, last_modified=snapshot.compiled_at)
+    headers['Access-Control-Allow-Origin'] = '*'
+    metrics.inc("bot_api_requests_total", endpoint=endpoint, status=str(status))
+    return status, headers, body
+
+@app.route('/api/runes')
+def api_runes_endpoint():
+    status, headers, body = api_response('runes', request.args, request.headers)
+    return Response(body, status=status, headers=headers)
+
+@app.route('/api/runes/<name>')
+def api_rune_endpoint(name):
+    status, headers, body = api_response('rune', request.args, request.headers, name)
+    return Response(body, status=status, headers=headers)
+
+@app.route('/api/categories')
+def api_categories_endpoint():
+    status, headers, body = api_response('categories', request.args, request.headers)
+    return Response(body, status=status, headers=headers)
+
+@app.route('/api/search')
+def api_search_endpoint():
+    status, headers, body = api_response('search', request.args, request.headers)
+    return Response(body, status=status, headers=headers)
+
+def web_api(endpoint):
+    """aiohttp handler for an API endpoint"""
+    async def handler(request):
+        status, headers, body = api_response(endpoint, request.query, request.headers, request.match_info.get('name'))
+        return web.Response(body=body, status=status, headers=headers)
+    return handler
+
+
+
+    # Bot version
+BOT_VERSION = "1.2.0"
+
+def build_version_response():
+    """Message for !version"""
+    changelog = load_changelog()
+    
+    embed = discord.Embed(
+        title="Ascenders Bot Version",
+        color=discord.Color.blue()
+    )
+    
+    embed.add_field(name="Version", value=f"`v{changelog['version']}`", inline=True)
+    embed.add_field(name="Last Updated", value=changelog['last_updated'], inline=True)
+    embed.add_field(name="Instance ID", value=f"`{INSTANCE_ID}`", inline=False)
+    return {"embed": embed}
+
+@bot.command(name='version')
+async def show_version(ctx):
+    """Show bot version information"""
+    await ctx.send(**build_version_response())
+
+def build_changelog_response(version=None):
+    """Message for !changelog"""
+    changelog = load_changelog()
+    
+    if version:
+        # Show specific version
+        change = changelog_store.find(version)
+        if change is None:
+            return {"content": f"Version `{version}` not found in changelog."}
+        
+        embed = discord.Embed(
+            title=f"Changelog - Version {version}",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Date", value=change['date'], inline=False)
+        
+        if change['features']:
+            features = "\n".join([f"• {feature}" for feature in change['features']])
+            embed.add_field(name="New Features", value=features, inline=False)
+        
+        if change['fixes']:
+            fixes = "\n".join([f"• {fix}" for fix in change['fixes']])
+            embed.add_field(name="Bug Fixes", value=fixes, inline=False)
+        
+        return {"embed": embed}
+    
+    # Show latest changes
+    latest = changelog['changes'][0]
+    embed = discord.Embed(
+        title="Latest Changes",
+        color=discord.Color.gold()
+    )
+    
+    embed.add_field(name="Version", value=f"`v{latest['version']}`", inline=True)
+    embed.add_field(name="Date", value=latest['date'], inline=True)
+    
+    if latest['features']:
+        features = "\n".join([f"• {feature}" for feature in latest['features']])
+        embed.add_field(name="New Features", value=features, inline=False)
     
     if latest['fixes']:
         fixes = "\n".join([f"• {fix}" for fix in latest['fixes']])
         embed.add_field(name="Bug Fixes", value=fixes, inline=False)
     
     embed.set_footer(text=f"Bot Version: v{changelog['version']} | Use !changelog [version] for older changes")
-    
-    await ctx.send(embed=embed)
+    return {"embed": embed}
 
-@bot.command(name='versions')
-async def show_all_versions(ctx):
-    """Show all available versions"""
+@bot.command(name='changelog')
+async def show_changelog(ctx, version: str = None):
+    """Show changelog information"""
+    await ctx.send(**build_changelog_response(version))
+
+def build_versions_response():
+    """Message for !versions"""
     changelog = load_changelog()
     
     versions = []
@@ -591,14 +2828,47 @@ async def show_all_versions(ctx):
     )
     
     embed.set_footer(text="Use !changelog [version] to see details for a specific version")
+    return {"embed": embed}
+
+@bot.command(name='versions')
+async def show_all_versions(ctx):
+    """Show all available versions"""
+    await ctx.send(**build_versions_response())
+
+
+
+@bot.command(name='reload')
+@commands.is_owner()
+async def reload_command(ctx):
+    """Reload rune data from the spreadsheet (bot owner only)"""
+    report = await asyncio.to_thread(reload_runes, True)
+    
+    if report.get("error"):
+        await ctx.send(f"Reload failed, still serving v{report['version']} ({report['runes']} runes): {report['error']}")
+        return
+    if not report["reloaded"]:
+        await ctx.send(f"Rune data unchanged (v{report['version']}, {report['runes']} runes, checked in {report.get('load_ms', 0)}ms)")
+        return
+    
+    embed = discord.Embed(
+        title=f"Reloaded Rune Data (v{report['version']})",
+        color=discord.Color.green()
+    )
+    embed.add_field(name="Runes", value=str(report["runes"]), inline=True)
+    embed.add_field(name="Load Time", value=f"{report['load_ms']}ms", inline=True)
+    embed.add_field(name="Changes", value=f"+{report['added']} added, -{report['removed']} removed, ~{report['changed']} changed", inline=False)
     
     await ctx.send(embed=embed)
 
+@reload_command.error
+async def reload_command_error(ctx, error):
+    if isinstance(error, commands.NotOwner):
+        await ctx.send("Only the bot owner can reload rune data.")
+        return
+    raise error
 
-
-@bot.command(name='help')
-async def help_command(ctx):
-    """Display help information"""
+def build_help_response():
+    """Message for !help"""
     embed = discord.Embed(
         title="Ascenders Incremental Bot Help",
         description="Commands for getting rune information:",
@@ -606,15 +2876,210 @@ async def help_command(ctx):
     )
     
     embed.add_field(name="!rune [rune_name]", value="Get detailed information about a specific rune", inline=False)
-    embed.add_field(name="!runes", value="List all available runes", inline=False)
+    embed.add_field(name="!runes [sort:rarity]", value="List all available runes, optionally from most common to rarest", inline=False)
+    embed.add_field(name="!rarest", value="List runes from rarest to most common", inline=False)
     embed.add_field(name="!category [category]", value="List runes by category (Basic, Color, Nature, etc.)", inline=False)
-    embed.add_field(name="!search [query]", value="Search for runes by name, rarity, or category", inline=False)
+    embed.add_field(name="!search [query]", value="Search for runes by name, rarity, or category, or a rarity range like `rarity:1B-1T`", inline=False)
+    embed.add_field(name="!stat [stat]", value="List the runes giving a stat (Rune Speed, Tickets, ...), largest amount first", inline=False)
+    embed.add_field(name="tier:[tier]", value=f"Add to any rune command to use another tier's sheet, e.g. `!latest tier:T12` (default {DEFAULT_TIER})", inline=False)
     embed.add_field(name="!ping", value="Check if the bot is responsive", inline=False)
+    embed.set_footer(text="Every command is also available as a slash command, e.g. /rune")
+    return {"embed": embed}
+
+@bot.command(name='help')
+async def help_command(ctx):
+    """Display help information"""
+    await ctx.send(**build_help_response())
+
+@bot.command(name='sync')
+@commands.is_owner()
+async def sync_command(ctx, scope: str = None):
+    """Register the slash commands with Discord (bot owner only)"""
+    if scope == 'guild' and ctx.guild is not None:
+        # Guild commands update instantly, global ones can take a while to show up
+        bot.tree.copy_global_to(guild=ctx.guild)
+        synced = await bot.tree.sync(guild=ctx.guild)
+        await ctx.send(f"Synced {len(synced)} slash commands to this server.")
+        return
+    synced = await bot.tree.sync()
+    await ctx.send(f"Synced {len(synced)} slash commands globally.")
+
+@sync_command.error
+async def sync_command_error(ctx, error):
+    if isinstance(error, commands.NotOwner):
+        await ctx.send("Only the bot owner can sync slash commands.")
+        return
+    raise error
+
+# Slash commands, mirroring the prefix commands above and sharing their responses
+
+async def send_slash_cached(interaction, command, argument, build, tier_name=None):
+    """Answer a slash command with a rune command's cached response"""
+    snapshot = rune_snapshot
+    if snapshot is None:
+        await interaction.response.send_message("Rune data is still loading, please try again in a few seconds.", ephemeral=True)
+        return
+    tier = snapshot.tier(tier_name)
+    if tier is None:
+        await interaction.response.send_message(unknown_tier_message(snapshot, tier_name), ephemeral=True)
+        return
     
-    await ctx.send(embed=embed)
+    async def send(**kwargs):
+        with timed('send'):
+            callback = await interaction.response.send_message(**kwargs)
+        return callback.resource
+    
+    await send_response(send, cached_response(snapshot, tier, command, argument, build))
+
+def autocomplete_choices(values):
+    """Autocomplete choices, within Discord's 100 character limit"""
+    return [app_commands.Choice(name=value[:100], value=value[:100]) for value in values]
+
+def autocomplete_tier(interaction):
+    """Tier picked in the command being typed, falling back to the default tier"""
+    snapshot = rune_snapshot
+    if snapshot is None:
+        return None
+    return snapshot.tier(getattr(interaction.namespace, 'tier', None)) or snapshot.default_tier
+
+async def rune_name_autocomplete(interaction, current: str):
+    tier = autocomplete_tier(interaction)
+    if tier is None:
+        return []
+    return autocomplete_choices(tier.index.complete_names(current))
+
+async def category_autocomplete(interaction, current: str):
+    tier = autocomplete_tier(interaction)
+    if tier is None:
+        return []
+    return autocomplete_choices(tier.index.complete_categories(current))
+
+async def stat_autocomplete(interaction, current: str):
+    tier = autocomplete_tier(interaction)
+    if tier is None:
+        return []
+    return autocomplete_choices(tier.index.complete_stats(current))
+
+async def tier_autocomplete(interaction, current: str):
+    snapshot = rune_snapshot
+    if snapshot is None:
+        return []
+    current = current.casefold()
+    return autocomplete_choices([name for name in snapshot.tiers if name.casefold().startswith(current)][:25])
+
+TIER_DESCRIPTION = f"Tier sheet to use, {DEFAULT_TIER} by default"
+
+@bot.tree.command(name='rune', description="Get information about a specific rune")
+@app_commands.describe(name="Rune name", tier=TIER_DESCRIPTION)
+@app_commands.autocomplete(name=rune_name_autocomplete, tier=tier_autocomplete)
+async def rune_slash(interaction, name: str, tier: str = None):
+    await send_slash_cached(interaction, 'rune', name, lambda data: build_rune_response(data, name), tier)
+
+@bot.tree.command(name='runes', description="List all available runes")
+@app_commands.describe(sort="Order to list them in, spreadsheet order by default", tier=TIER_DESCRIPTION)
+@app_commands.choices(sort=[app_commands.Choice(name="rarity", value="rarity")])
+@app_commands.autocomplete(tier=tier_autocomplete)
+async def runes_slash(interaction, sort: str = None, tier: str = None):
+    await send_slash_cached(interaction, 'runes', sort or '', lambda data: build_runes_list_response(data, sort), tier)
+
+@bot.tree.command(name='rarest', description="List runes from rarest to most common")
+@app_commands.describe(tier=TIER_DESCRIPTION)
+@app_commands.autocomplete(tier=tier_autocomplete)
+async def rarest_slash(interaction, tier: str = None):
+    await send_slash_cached(interaction, 'rarest', '', build_rarest_response, tier)
+
+@bot.tree.command(name='category', description="List runes by category")
+@app_commands.describe(name="Category name", tier=TIER_DESCRIPTION)
+@app_commands.autocomplete(name=category_autocomplete, tier=tier_autocomplete)
+async def category_slash(interaction, name: str, tier: str = None):
+    await send_slash_cached(interaction, 'category', name, lambda data: build_category_response(data, name), tier)
+
+@bot.tree.command(name='search', description="Search for runes by name, rarity or category")
+@app_commands.describe(query="Text to search for, or a rarity range like rarity:1B-1T", tier=TIER_DESCRIPTION)
+@app_commands.autocomplete(tier=tier_autocomplete)
+async def search_slash(interaction, query: str, tier: str = None):
+    await send_slash_cached(interaction, 'search', query, lambda data: build_search_response(data, query), tier)
+
+@bot.tree.command(name='stat', description="List the runes giving a stat, largest amount first")
+@app_commands.describe(name="Stat name, like Rune Speed", tier=TIER_DESCRIPTION)
+@app_commands.autocomplete(name=stat_autocomplete, tier=tier_autocomplete)
+async def stat_slash(interaction, name: str, tier: str = None):
+    await send_slash_cached(interaction, 'stat', name, lambda data: build_stat_response(data, name), tier)
+
+@bot.tree.command(name='latest', description="Show the latest recommended runes from the spreadsheet")
+@app_commands.describe(tier=TIER_DESCRIPTION)
+@app_commands.autocomplete(tier=tier_autocomplete)
+async def latest_slash(interaction, tier: str = None):
+    await send_slash_cached(interaction, 'latest', '', build_latest_response, tier)
+
+@bot.tree.command(name='ping', description="Check if the bot is responsive")
+async def ping_slash(interaction):
+    latency = bot.latency * 1000
+    await interaction.response.send_message(f'Pong! Latency: {latency:.2f}ms (Instance: {INSTANCE_ID})')
+
+@bot.tree.command(name='version', description="Show bot version information")
+async def version_slash(interaction):
+    await interaction.response.send_message(**build_version_response())
+
+@bot.tree.command(name='changelog', description="Show changelog information")
+@app_commands.describe(version="Version to show, defaults to the latest changes")
+async def changelog_slash(interaction, version: str = None):
+    await interaction.response.send_message(**build_changelog_response(version))
+
+@bot.tree.command(name='versions', description="Show all available versions")
+async def versions_slash(interaction):
+    await interaction.response.send_message(**build_versions_response())
+
+@bot.tree.command(name='help', description="Display help information")
+async def help_slash(interaction):
+    await interaction.response.send_message(**build_help_response())
 
 # Keep the bot running on the correct port for Render
-if __name__ == "__main__":
-    keep_alive()  # Start the web server
+async def main():
+    """Start the web server and the Discord bot on one event loop"""
+    runner = None
+    if HTTP_SERVER == 'flask':
+        keep_alive()  # Start the web server
+    elif HTTP_SERVER != 'none':
+        runner = await start_web_server()
     start_keep_alive_service()
-    bot.run(os.getenv('DISCORD_TOKEN'))  # Start the Discord bot
\ No newline at end of file
+    
+    discord.utils.setup_logging()
+    
+    # Render stops services with SIGTERM; close the bot so the cleanup below runs
+    # and the leader lease is handed over right away
+    closing_tasks = []
+    
+    def on_sigterm():
+        print("SIGTERM received, shutting down")
+        closing_tasks.append(asyncio.create_task(bot.close()))
+    
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, on_sigterm)
+    except NotImplementedError:
+        pass  # No signal handlers on Windows event loops
+    
+    try:
+        async with bot:
+            await bot.start(os.getenv('DISCORD_TOKEN'))  # Start the Discord bot
+    finally:
+        await leader.stop()
+        if runner is not None:
+            await runner.cleanup()
+
+# Command line tools: python mainbot.py <command>
+# (benchmarks and parser checks are in bench.py)
+CLI_COMMANDS = {
+    'build-snapshot': build_snapshot_command,
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        if sys.argv[1] not in CLI_COMMANDS:
+            sys.exit(f"Unknown command '{sys.argv[1]}'. Available: {', '.join(CLI_COMMANDS)}")
+        CLI_COMMANDS[sys.argv[1]]()
+        sys.exit(0)
+    if SHARD_MODE == 'process' and SHARD_IDS is None:
+        run_shard_supervisor()
+    else:
+        asyncio.run(main())
\ No newline at end of file
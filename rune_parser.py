@@ -0,0 +1,204 @@
+import os
+import re
+
+# Spreadsheet parsing for mainbot. Nothing here runs at import time, so the process pool
+# that parses several workbooks at once can import this module without starting a bot.
+
+# Spreadsheet the rune data is parsed from
+RUNES_FILE = 'BROT13.xlsx'
+RUNES_SHEET = 'Better Rune Order (T13 Late Gam'
+
+# Bump this whenever the parsing rules change so old snapshots get rebuilt
+PARSER_VERSION = 3
+
+# Pattern: (rarity) RuneName or Rarity RuneName, skipping tags like [EXP] before the name
+RUNE_PATTERN = r'[([]?(1/[\d.]+[A-Za-z]*)[)\]]?\s+(?:\[[A-Za-z]+\]\s*)*([A-Za-z][A-Za-z\s]*)'
+# Pattern of the rune detail entries below the category headers: - RuneName rarity (notes)
+# The rarity may come after other text, like "1/God Knows How Much or 1/2TSg", and have a space before its suffix
+DETAIL_PATTERN = r'^-\s+([A-Za-z][A-Za-z ]*)\s+(?:[^(\[]*?\s)?(1/[\d.]+(?:\s?[A-Z][A-Za-z]*)?)'
+MISSING_STATS = "Stats not found in spreadsheet"
+
+def parse_rune_frame(df):
+    """Extract rune data from the raw sheet, working on whole columns at once"""
+    import numpy as np
+    import pandas as pd
+    
+    # Flatten the sheet into its non-empty cells, in row-major order
+    values = df.to_numpy(dtype=object)
+    rows, columns = np.nonzero(df.notna().to_numpy())
+    cells = pd.Series(values[rows, columns], dtype=object).map(str)
+    not_link = ~cells.str.startswith("http")
+    
+    # Category headers: first cell per row containing "Rune:", carried forward to later rows
+    is_header = cells.str.contains("Rune:", regex=False) & not_link
+    headers = (cells[is_header].str.split("Rune:", n=1).str[0] + "Rune:").str.strip().groupby(rows[is_header.to_numpy()]).first()
+    row_category = headers.reindex(range(len(df))).ffill().fillna("")
+    
+    # Stats: first "Stats:" cell per row, shifted up so each row sees the next row's stats
+    is_stats = cells.str.contains("Stats:", regex=False)
+    stats = cells[is_stats].str.replace("Stats:", "", regex=False).str.strip().groupby(rows[is_stats.to_numpy()]).first()
+    next_row_stats = stats.reindex(range(len(df))).shift(-1).fillna(MISSING_STATS)
+    
+    # Rune entries: cells with a rarity pattern like "1/", as order cells or "- " detail entries
+    is_rune = cells.str.contains("1/", regex=False) & not_link
+    is_detail = cells.str.startswith("- ")
+    order = cells[is_rune & ~is_detail].str.extract(RUNE_PATTERN)
+    detail = cells[is_rune & is_detail].str.extract(DETAIL_PATTERN)
+    names = pd.concat([order[1], detail[0]]).sort_index()
+    rarities = pd.concat([order[0], detail[1].str.replace(r'\s', '', regex=True)]).sort_index()
+    matched = names.notna()
+    rune_rows = rows[names.index[matched].to_numpy()]
+    categories = row_category.to_numpy()[rune_rows]
+    
+    runes = {}
+    for name, rarity, category, rune_stats in zip(names[matched].str.strip(), rarities[matched], categories, next_row_stats.to_numpy()[rune_rows]):
+        runes[name] = {
+            "rarity": rarity,
+            "category": category if category else "Unknown",
+            "stats": rune_stats
+        }
+    return runes
+
+def read_rune_sheet(path=RUNES_FILE, sheet=RUNES_SHEET):
+    """Read the rune sheet into a raw DataFrame"""
+    import pandas as pd
+    
+    df = pd.read_excel(path, sheet_name=sheet, header=None)
+    print(f"Successfully loaded Excel file with {len(df)} rows")
+    return df
+
+# Cell texts pandas reads as NaN by default, skipped by the streaming reader as well
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+def open_workbook(path=RUNES_FILE):
+    """Open a workbook for streaming reads"""
+    import openpyxl
+    
+    return openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+
+def sheet_cells(rows):
+    """(row_index, non-empty cells as text) for raw worksheet rows"""
+    for index, row in enumerate(rows):
+        cells = []
+        for value in row:
+            if value is None:
+                continue
+            if isinstance(value, float) and value.is_integer():
+                # Match pandas, which reads whole-number floats as ints
+                value = int(value)
+            value = str(value)
+            if value not in NA_STRINGS:
+                cells.append(value)
+        if cells:
+            yield index, cells
+
+def iter_sheet_rows(path=RUNES_FILE, sheet=RUNES_SHEET):
+    """Stream (row_index, non-empty cells) from a read-only workbook cursor"""
+    workbook = open_workbook(path)
+    try:
+        yield from sheet_cells(workbook[sheet].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+def find_stats(cells):
+    """Return the first "Stats:" cell of a row, if any"""
+    for cell in cells:
+        if "Stats:" in cell:
+            return cell.replace("Stats:", "").strip()
+    return None
+
+def category_name(cell):
+    """A category header's name, without the notes some headers have after 'Rune:'"""
+    return cell[:cell.index("Rune:") + len("Rune:")].strip()
+
+def match_rune(cell):
+    """(name, rarity) of a rune entry like '(1/7.5B) Bloom >' or '- Bloom 1/7.5B (MAX 9K)', or None"""
+    if cell.startswith("- "):
+        match = re.search(DETAIL_PATTERN, cell)
+        return (match.group(1).strip(), re.sub(r'\s', '', match.group(2))) if match else None
+    match = re.search(RUNE_PATTERN, cell)
+    return (match.group(2).strip(), match.group(1)) if match else None
+
+def extract_runes(rows, lookup=find_stats):
+    """Extract rune data from a stream of (row_index, cells) tuples, reading stats rows with lookup"""
+    runes = {}
+    current_category = ""
+    # Runes found on the previous row, waiting for the stats on the row below
+    pending = []
+    pending_index = None
+    
+    for index, cells in rows:
+        if pending:
+            stats = lookup(cells) if index == pending_index + 1 else None
+            for rune_name, rune in pending:
+                rune["stats"] = stats or MISSING_STATS
+                runes[rune_name] = rune
+            pending = []
+        
+        # Look for category headers (rows that contain "Rune:")
+        for cell in cells:
+            if "Rune:" in cell and not cell.startswith("http"):
+                current_category = category_name(cell)
+                break
+        
+        # Look for rune entries (cells that contain rarity patterns like "1/")
+        for cell in cells:
+            if "1/" in cell and not cell.startswith("http"):
+                match = match_rune(cell)
+                if match:
+                    pending.append((match[0], {
+                        "rarity": match[1],
+                        "category": current_category if current_category else "Unknown",
+                        "stats": MISSING_STATS
+                    }))
+        pending_index = index
+    
+    for rune_name, rune in pending:
+        runes[rune_name] = rune
+    return runes
+
+# Which parser reads the spreadsheet: 'stream' (openpyxl, no pandas) or 'pandas'
+RUNE_PARSER = os.environ.get('RUNE_PARSER', 'stream')
+
+def extract_recommended(rows):
+    """Rune names in the sheet's '(Recommended)' order block, in order"""
+    block = []
+    previous = None
+    found = False
+    for index, cells in rows:
+        # Blocks are runs of consecutive non-empty rows
+        if previous is not None and index != previous + 1:
+            if found:
+                break
+            block = []
+        block.append(cells)
+        previous = index
+        if any(cell.strip().startswith("(Recommended)") for cell in cells):
+            found = True
+    if not found:
+        return []
+    
+    names = []
+    for cells in block:
+        for cell in cells:
+            if "1/" in cell and not cell.startswith("http"):
+                match = re.search(RUNE_PATTERN, cell)
+                if match and match.group(2).strip() not in names:
+                    names.append(match.group(2).strip())
+    return names
+
+def parse_rune_sheet(path, sheet):
+    """Runes and recommended order of one rune order sheet, raising on failure"""
+    if RUNE_PARSER == 'pandas':
+        df = read_rune_sheet(path, sheet)
+        rows = list(sheet_cells(df.astype(object).where(df.notna(), None).itertuples(index=False)))
+        return {"runes": parse_rune_frame(df), "recommended": extract_recommended(rows)}
+    rows = list(iter_sheet_rows(path, sheet))
+    return {"runes": extract_runes(rows), "recommended": extract_recommended(rows)}
+
+def parse_runes_from_excel(path=RUNES_FILE, sheet=RUNES_SHEET):
+    """Parse the rune sheet of the spreadsheet, raising on failure"""
+    return parse_rune_sheet(path, sheet)["runes"]
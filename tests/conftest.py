@@ -0,0 +1,27 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+# mainbot is a single module at the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import mainbot
+
+
+@pytest.fixture(scope='session')
+def root():
+    """The repository root, where the bot's data files live"""
+    return ROOT
+
+
+@pytest.fixture
+def workbook_dir(root, tmp_path, monkeypatch):
+    """A working directory holding a copy of the rune spreadsheet, with no runes loaded yet"""
+    shutil.copy(os.path.join(root, mainbot.RUNES_FILE), tmp_path / mainbot.RUNES_FILE)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mainbot, 'rune_snapshot', None)
+    monkeypatch.setattr(mainbot, 'rune_file_stamp', None)
+    return tmp_path
@@ -0,0 +1,71 @@
+import pytest
+
+import mainbot
+
+
+def get(path, headers=None):
+    return mainbot.app.test_client().get(path, headers=headers or {})
+
+
+def test_last_modified_survives_a_restart(workbook_dir, monkeypatch):
+    mainbot.reload_runes(force=True)
+    first = get('/api/runes')
+    assert first.status_code == 200
+    
+    # A new process loading the same compiled snapshot
+    monkeypatch.setattr(mainbot, 'rune_snapshot', None)
+    mainbot.reload_runes(force=True)
+    again = get('/api/runes')
+    assert again.headers['Last-Modified'] == first.headers['Last-Modified']
+    assert get('/api/runes', {'If-Modified-Since': first.headers['Last-Modified']}).status_code == 304
+
+
+def test_last_modified_moves_when_the_data_is_recompiled(workbook_dir, monkeypatch):
+    mainbot.reload_runes(force=True)
+    compiled_at = mainbot.rune_snapshot.compiled_at
+    
+    (workbook_dir / mainbot.RUNES_SNAPSHOT_FILE).unlink()
+    monkeypatch.setattr(mainbot, 'rune_snapshot', None)
+    monkeypatch.setattr(mainbot.time, 'time', lambda: compiled_at + 60)
+    mainbot.reload_runes(force=True)
+    assert mainbot.rune_snapshot.compiled_at == compiled_at + 60
+
+
+NAMES = ["Bloom", "Aether", "", "Superstar", "Nexus"]
+
+
+def test_cursor_continues_after_its_rune():
+    cursor = mainbot.encode_cursor(2, "Aether")
+    assert mainbot.cursor_offset(cursor, NAMES) == 2
+
+
+def test_cursor_follows_its_rune_when_the_list_changed():
+    cursor = mainbot.encode_cursor(2, "Aether")
+    assert mainbot.cursor_offset(cursor, ["New", "Bloom", "Aether", "Nexus"]) == 3
+
+
+def test_cursor_after_a_blank_named_rune():
+    cursor = mainbot.encode_cursor(3, "")
+    assert cursor
+    assert mainbot.cursor_offset(cursor, NAMES) == 3
+
+
+@pytest.mark.parametrize('cursor', ["zzz", "!!", mainbot.encode_cursor(2, "Gone"), "eDpCbG9vbQ"])
+def test_invalid_cursors(cursor):
+    # Not base64, no separator, a rune that is gone, and 'x:Bloom'
+    with pytest.raises(mainbot.ApiError) as error:
+        mainbot.cursor_offset(cursor, NAMES)
+    assert error.value.status == 400
+
+
+def test_paging_with_cursors_returns_every_rune_once(workbook_dir):
+    mainbot.reload_runes(force=True)
+    seen = []
+    cursor = None
+    while True:
+        page = get('/api/runes?limit=7&fields=rarity' + (f'&cursor={cursor}' if cursor else '')).get_json()
+        seen += [rune["name"] for rune in page["runes"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == list(mainbot.rune_snapshot.runes)
@@ -0,0 +1,75 @@
+import asyncio
+
+import mainbot
+
+
+def test_throttled_channel_does_not_block_other_channels():
+    async def run():
+        queue = mainbot.SendQueue()
+        throttled = asyncio.Event()
+        sent = []
+        
+        async def send(channel, text):
+            if channel == 1:
+                # Waiting out a 429
+                await throttled.wait()
+            sent.append((channel, text))
+            return text
+        
+        slow = [asyncio.create_task(queue.submit(1, lambda i=i: send(1, i))) for i in range(5)]
+        assert await asyncio.wait_for(queue.submit(2, lambda: send(2, "fast")), 1) == "fast"
+        assert sent == [(2, "fast")]
+        
+        throttled.set()
+        assert await asyncio.gather(*slow) == list(range(5))
+        # Idle channels don't keep a worker
+        assert queue.workers == {} and queue.queues == {}
+    
+    asyncio.run(run())
+
+
+def test_responses_go_before_notices_within_a_channel():
+    async def run():
+        queue = mainbot.SendQueue()
+        release = asyncio.Event()
+        sent = []
+        
+        async def send(text):
+            if text == "first":
+                await release.wait()
+            sent.append(text)
+        
+        first = asyncio.create_task(queue.submit(1, lambda: send("first")))
+        await asyncio.sleep(0)
+        notice = asyncio.create_task(queue.submit(1, lambda: send("notice"), mainbot.PRIORITY_NOTICE))
+        response = asyncio.create_task(queue.submit(1, lambda: send("response")))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, notice, response)
+        assert sent == ["first", "response", "notice"]
+    
+    asyncio.run(run())
+
+
+def test_send_errors_reach_the_caller():
+    async def run():
+        queue = mainbot.SendQueue()
+        
+        async def fail():
+            raise RuntimeError("forbidden")
+        
+        try:
+            await queue.submit(1, fail)
+        except RuntimeError as e:
+            return str(e)
+    
+    assert asyncio.run(run()) == "forbidden"
+
+
+def test_coalescing_only_while_in_flight():
+    coalescer = mainbot.QueryCoalescer()
+    assert coalescer.claim("key")
+    assert not coalescer.claim("key")
+    coalescer.release("key")
+    # Repeated after the answer went out
+    assert coalescer.claim("key")
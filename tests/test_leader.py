@@ -0,0 +1,89 @@
+import time
+
+import fakeredis
+import pytest
+
+import mainbot
+
+KEY = 'test:leader'
+TTL = 30
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def backend(request, tmp_path):
+    if request.param == 'sqlite':
+        return mainbot.SQLiteLeaseBackend(str(tmp_path / 'leader.sqlite3'))
+    return mainbot.RedisLeaseBackend(fakeredis.FakeRedis())
+
+
+def test_free_lease_is_acquired(backend):
+    assert backend.try_acquire(KEY, 'a', 100.0, TTL)
+    # Renewing our own lease
+    assert backend.try_acquire(KEY, 'a', 100.0, TTL)
+
+
+def test_newer_instance_takes_over(backend):
+    assert backend.try_acquire(KEY, 'old', 100.0, TTL)
+    assert backend.try_acquire(KEY, 'new', 200.0, TTL)
+    assert not backend.try_acquire(KEY, 'old', 100.0, TTL)
+
+
+def test_older_instance_is_refused(backend):
+    assert backend.try_acquire(KEY, 'new', 200.0, TTL)
+    assert not backend.try_acquire(KEY, 'old', 100.0, TTL)
+
+
+def test_release_hands_the_lease_over(backend):
+    assert backend.try_acquire(KEY, 'new', 200.0, TTL)
+    backend.release(KEY, 'new', 200.0)
+    assert backend.try_acquire(KEY, 'old', 100.0, TTL)
+
+
+def test_release_keeps_someone_elses_lease(backend):
+    assert backend.try_acquire(KEY, 'new', 200.0, TTL)
+    backend.release(KEY, 'old', 100.0)
+    assert not backend.try_acquire(KEY, 'old', 100.0, TTL)
+
+
+def test_expired_lease_is_free(backend):
+    assert backend.try_acquire(KEY, 'new', 200.0, 0.05)
+    time.sleep(0.1)
+    assert backend.try_acquire(KEY, 'old', 100.0, TTL)
+
+
+def test_redis_value_without_separator_is_taken_over():
+    client = fakeredis.FakeRedis()
+    client.set(KEY, 'garbage')
+    assert mainbot.RedisLeaseBackend(client).try_acquire(KEY, 'a', 100.0, TTL)
+    assert client.get(KEY) == b'100.0:a'
+
+
+def test_takeover_is_reported(backend):
+    assert backend.try_acquire(KEY, 'old', 100.0, TTL) == mainbot.LEASE_ACQUIRED
+    assert backend.try_acquire(KEY, 'new', 200.0, TTL) == mainbot.LEASE_TAKEN_OVER
+    assert backend.try_acquire(KEY, 'new', 200.0, TTL) == mainbot.LEASE_ACQUIRED
+    assert backend.try_acquire(KEY, 'old', 100.0, TTL) == mainbot.LEASE_REFUSED
+
+
+def test_newer_instance_waits_for_the_old_leader_to_step_down(backend):
+    lease_seconds = 0.3
+    old = mainbot.LeaderElection(backend, KEY, 'old', 100.0, lease_seconds)
+    new = mainbot.LeaderElection(backend, KEY, 'new', 200.0, lease_seconds)
+    old.renew()
+    assert old.is_leader
+    
+    # The old leader hasn't renewed yet, so the new one must not lead either
+    new.renew()
+    assert not new.is_leader
+    old.renew()
+    assert not old.is_leader
+    
+    time.sleep(new.handover_seconds)
+    new.renew()
+    assert new.is_leader
+
+
+def test_free_lease_leads_at_once(backend):
+    election = mainbot.LeaderElection(backend, KEY, 'a', 100.0, TTL)
+    election.renew()
+    assert election.is_leader
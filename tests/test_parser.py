@@ -0,0 +1,52 @@
+import json
+import os
+
+import pytest
+
+import bench
+import rune_parser
+
+
+@pytest.fixture(scope='module')
+def runes_file(root):
+    return os.path.join(root, rune_parser.RUNES_FILE)
+
+
+@pytest.fixture(scope='module')
+def sheet(runes_file):
+    return rune_parser.read_rune_sheet(runes_file, rune_parser.RUNES_SHEET)
+
+
+@pytest.fixture(scope='module')
+def legacy_runes(sheet):
+    return bench.parse_rune_frame_legacy(sheet)
+
+
+def test_legacy_parser_finds_runes(legacy_runes):
+    assert len(legacy_runes) > 0
+
+
+def test_vectorized_parser_matches_legacy(sheet, legacy_runes):
+    assert list(rune_parser.parse_rune_frame(sheet).items()) == list(legacy_runes.items())
+
+
+def test_streaming_parser_matches_legacy(runes_file, legacy_runes):
+    rows = rune_parser.iter_sheet_rows(runes_file, rune_parser.RUNES_SHEET)
+    assert list(rune_parser.extract_runes(rows).items()) == list(legacy_runes.items())
+
+
+def test_stats_come_from_the_rune_detail_entries(legacy_runes):
+    assert legacy_runes["Mystery"] == {
+        "rarity": "1/1T",
+        "category": "Basic Rune:",
+        "stats": "x1 Rune Bulk (MAX x5) + -0.1s RToken Cooldown (MAX -60s)",
+    }
+    assert legacy_runes["Vanguard"]["stats"].startswith("x1 Rune Speed (MAX x15)")
+    assert "" not in legacy_runes
+
+
+def test_parser_matches_the_golden_file(root, runes_file):
+    with open(os.path.join(root, bench.RUNES_GOLDEN_FILE), encoding='utf-8') as f:
+        expected = json.load(f)
+    runes = rune_parser.extract_runes(rune_parser.iter_sheet_rows(runes_file, rune_parser.RUNES_SHEET))
+    assert bench.diff_golden(expected, bench.golden_runes(runes)) == []
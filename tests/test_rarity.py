@@ -0,0 +1,40 @@
+import math
+
+import pytest
+
+import mainbot
+
+
+@pytest.mark.parametrize('text, odds', [
+    ("1/100", 100.0),
+    ("1/2K", 2e3),
+    ("1/7.5B", 7.5e9),
+    ("1/1Ce", 1e303),
+    # A multiplier in front of a decade
+    ("1/5QdDe", 5e45),
+    ("1/20SxVt", 2e82),
+    (" 1/3M ", 3e6),
+])
+def test_parse_rarity(text, odds):
+    assert mainbot.parse_rarity(text) == pytest.approx(odds)
+
+
+@pytest.mark.parametrize('text', ["garbage", "", "1/", "1/5Zz", "2/5B", "1/5B extra"])
+def test_unreadable_rarity(text):
+    assert mainbot.parse_rarity(text) is None
+
+
+def test_rarity_beyond_float_range_is_infinite():
+    assert math.isinf(mainbot.parse_rarity("1/1" + "0" * 400 + "Ce"))
+
+
+def test_rarities_sort_by_odds():
+    texts = ["1/1Ce", "1/7.5B", "1/1T", "1/5QdDe", "1/15B"]
+    assert sorted(texts, key=mainbot.parse_rarity) == ["1/7.5B", "1/15B", "1/1T", "1/5QdDe", "1/1Ce"]
+
+
+def test_parse_rarity_range():
+    assert mainbot.parse_rarity_range("1B-1T") == (1e9, 1e12)
+    assert mainbot.parse_rarity_range("1/1T - 1/1B") == (1e9, 1e12)
+    assert mainbot.parse_rarity_range("7.5B") == (7.5e9, 7.5e9)
+    assert mainbot.parse_rarity_range("1B-nope") is None
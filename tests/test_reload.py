@@ -0,0 +1,40 @@
+import mainbot
+
+
+def test_truncated_workbook_keeps_current_data(workbook_dir):
+    first = mainbot.reload_runes(force=True)
+    assert first["reloaded"] and first["runes"] > 0
+    good = mainbot.rune_snapshot
+    stamp = mainbot.rune_file_stamp
+    
+    # A half-finished upload
+    path = workbook_dir / mainbot.RUNES_FILE
+    path.write_bytes(path.read_bytes()[:4096])
+    report = mainbot.reload_runes()
+    
+    assert not report["reloaded"]
+    assert report["error"]
+    assert report["runes"] == first["runes"]
+    assert mainbot.rune_snapshot is good
+    assert mainbot.rune_file_stamp == stamp
+
+
+def test_missing_workbook_keeps_current_data(workbook_dir):
+    mainbot.reload_runes(force=True)
+    good = mainbot.rune_snapshot
+    
+    (workbook_dir / mainbot.RUNES_FILE).unlink()
+    report = mainbot.reload_runes()
+    
+    assert report["error"]
+    assert mainbot.rune_snapshot is good
+
+
+def test_first_load_falls_back_to_sample_data(workbook_dir, monkeypatch):
+    def broken(sheets):
+        raise ValueError("broken sheet")
+    monkeypatch.setattr(mainbot, 'parse_rune_workbooks', broken)
+    report = mainbot.reload_runes()
+    
+    assert report["reloaded"]
+    assert set(mainbot.rune_snapshot.runes) == set(mainbot.SAMPLE_RUNES)
@@ -0,0 +1,46 @@
+import math
+
+import mainbot
+
+
+def entries(text):
+    return [(entry.name, entry.amount, entry.cap) for entry in mainbot.parse_stats(text)]
+
+
+def test_plus_inside_brackets_and_negative_amounts():
+    text = "x1 Rune Bulk (MAX x5) + -0.1s RToken Cooldown (MAX -60s)"
+    assert mainbot.split_stat_entries(text) == ["x1 Rune Bulk (MAX x5)", "-0.1s RToken Cooldown (MAX -60s)"]
+    assert entries(text) == [("Rune Bulk", "x1", "x5"), ("RToken Cooldown", "-0.1s", "-60s")]
+
+
+def test_leading_plus_is_a_sign():
+    text = "+50 Base Chrome + x3 Rune Speed"
+    assert mainbot.split_stat_entries(text) == ["+50 Base Chrome", "x3 Rune Speed"]
+    assert entries(text) == [("Base Chrome", "+50", None), ("Rune Speed", "x3", None)]
+
+
+def test_tags_are_dropped_from_names():
+    assert entries("x2 Rune Speed [EXPONENTIAL] (MAX 3M) + x1 Rune Bulk (MAX x3)") == [
+        ("Rune Speed", "x2", "3M"),
+        ("Rune Bulk", "x1", "x3"),
+    ]
+    assert entries("x500 Chrome [EXP]") == [("Chrome", "x500", None)]
+
+
+def test_aliases():
+    assert entries("x500 RS [EXP] + x2 Rune Bullk (MAX x10)") == [("Rune Speed", "x500", None), ("Rune Bulk", "x2", "x10")]
+
+
+def test_rune_leftovers_are_skipped():
+    assert entries("(1/250Nosg) Apex >") == []
+    assert entries("x2 Tickets + (1/20SxVt)   Immortality >") == [("Tickets", "x2", None)]
+
+
+def test_amount_values():
+    first, second = mainbot.parse_stats("x1.5K Chrome + -0.1s Cooldown")
+    assert first.value == 1500.0
+    # The size of the amount, for ranking, whatever its sign
+    assert second.value == 0.1
+    assert mainbot.parse_stats("x1 Tickets (MAX 1DDe)")[0].value == 1.0
+    assert mainbot.stat_amount_value("1", "Zz") is None
+    assert math.isinf(mainbot.stat_amount_value("1e300", "Ce"))
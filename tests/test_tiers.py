@@ -0,0 +1,33 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import mainbot
+
+
+def test_split_tier():
+    assert mainbot.split_tier("Bloom tier:T12") == ("T12", "Bloom")
+    assert mainbot.split_tier("tier:12 Bloom Rune") == ("12", "Bloom Rune")
+    assert mainbot.split_tier("Bloom") == (None, "Bloom")
+    assert mainbot.split_tier("tier:T12") == ("T12", "")
+
+
+class UsageContext:
+    def __init__(self, command):
+        self.command = command
+        self.clean_prefix = '!'
+        self.channel = SimpleNamespace(id=0)
+        self.sent = []
+    
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content)
+
+
+@pytest.mark.parametrize('name', ['rune', 'category', 'search', 'stat'])
+def test_tier_option_alone_replies_with_usage(name):
+    command = mainbot.bot.get_command(name)
+    ctx = UsageContext(command)
+    argument = next(iter(command.clean_params))
+    asyncio.run(command.callback(ctx, **{argument: "tier:T13"}))
+    assert ctx.sent == [f"Usage: `!{name} {command.usage}`"]